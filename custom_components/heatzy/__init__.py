@@ -4,31 +4,50 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.typing import ConfigType
 
-from .const import PLATFORMS
-from .coordinator import HeatzyDataUpdateCoordinator
+from .const import DOMAIN
+from .coordinator import HeatzyDataUpdateCoordinator, async_get_store
+from .services import async_setup_services
+from .settings import async_get_settings_store
 
 type HeatzyConfigEntry = ConfigEntry[HeatzyDataUpdateCoordinator]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Heatzy services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: HeatzyConfigEntry) -> bool:
     """Set up Heatzy as config entry."""
     coordinator = HeatzyDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    if not await coordinator.async_restore():
+        await coordinator.async_config_entry_first_refresh()
     entry.runtime_data = coordinator
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Platforms without entities for the account are not loaded
+    coordinator.platforms = coordinator.async_get_platforms()
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+    entry.async_on_unload(
+        coordinator.async_add_listener(coordinator.async_check_platforms)
+    )
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: HeatzyConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        if entry.runtime_data.unsub:
-            entry.runtime_data.unsub()
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, entry.runtime_data.platforms
+    ):
+        await entry.runtime_data.async_stop_websocket()
 
     return unload_ok
 
@@ -38,6 +57,12 @@ async def _async_update_listener(hass: HomeAssistant, entry: HeatzyConfigEntry):
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: HeatzyConfigEntry) -> None:
+    """Remove the last known devices and their settings."""
+    await async_get_store(hass, entry).async_remove()
+    await async_get_settings_store(hass, entry).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: ConfigEntry, device_entry: dr.DeviceEntry
 ) -> bool:
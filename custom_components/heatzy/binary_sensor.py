@@ -13,15 +13,15 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CONF_CUR_MODE, CONF_DEROG_MODE, CONF_PRODUCT_KEY, PILOTE_PRO_V1
-from .entity import HeatzyEntity
+from .const import PILOTE_PRO_V1
+from .entity import HeatzyEntity, async_get_descriptions, index_descriptions
 
 
 @dataclass(frozen=True, kw_only=True)
 class HeatzyBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Represents an Flow Sensor."""
 
-    products: list[str]
+    products: frozenset[str]
     value_fn: Callable[..., Any]
     cls: Callable[..., Any] = lambda *args: HeatzyBinarySensor(*args)
 
@@ -34,11 +34,12 @@ BINARY_SENSOR_TYPES: Final[tuple[HeatzyBinarySensorEntityDescription, ...]] = (
         products=PILOTE_PRO_V1,
         device_class=BinarySensorDeviceClass.OCCUPANCY,
         icon="mdi:location-enter",
-        value_fn=lambda attrs: attrs.get(CONF_DEROG_MODE) == 3
-        and attrs.get(CONF_CUR_MODE) == "cft",
+        value_fn=lambda state: state.derog_mode == 3 and state.mode == "cft",
     ),
 )
 
+BINARY_SENSOR_INDEX = index_descriptions(BINARY_SENSOR_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -47,14 +48,11 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensors."""
     coordinator = entry.runtime_data
-    entities = []
-
-    for unique_id, device in coordinator.data.items():
-        product_key = device.get(CONF_PRODUCT_KEY)
-        for description in BINARY_SENSOR_TYPES:
-            cls = description.cls
-            if product_key in description.products:
-                entities.extend([cls(coordinator, description, unique_id)])
+    entities = [
+        description.cls(coordinator, description, unique_id)
+        for unique_id, device in coordinator.data.items()
+        for description in async_get_descriptions(BINARY_SENSOR_INDEX, device)
+    ]
 
     async_add_entities(entities)
 
@@ -67,4 +65,4 @@ class HeatzyBinarySensor(HeatzyEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Presence status."""
-        return self.entity_description.value_fn(self._attrs)
+        return self.entity_description.value_fn(self._device_state)
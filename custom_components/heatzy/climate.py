@@ -1,8 +1,11 @@
 """Climate sensors for Heatzy."""
 
+import asyncio
 import logging
+from collections import Counter
 from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Any
 
 import voluptuous as vol
@@ -21,36 +24,30 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.const import CONF_DELAY, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_platform
-from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
 
 from . import HeatzyConfigEntry, HeatzyDataUpdateCoordinator
 from .const import (
+    ATTR_BOOST,
+    ATTR_VACATION,
     BLOOM,
-    CFT_TEMP_H,
     CFT_TEMP_L,
     CONF_ATTRS,
     CONF_CFT_TEMP,
-    CONF_CUR_MODE,
-    CONF_CUR_SIGNAL,
-    CONF_CUR_TEMP,
     CONF_DEROG_MODE,
     CONF_DEROG_TIME,
     CONF_ECO_TEMP,
-    CONF_HEATING_STATE,
-    CONF_HUMIDITY,
-    CONF_IS_ONLINE,
     CONF_MODE,
     CONF_ON_OFF,
-    CONF_PRODUCT_KEY,
     CONF_TIMER_SWITCH,
-    CUR_TEMP_L,
+    CONF_ZONES,
     DEFAULT_BOOST,
     DEFAULT_VACATION,
-    ECO_TEMP_H,
     ECO_TEMP_L,
     FROST_TEMP,
     GLOW,
@@ -63,7 +60,12 @@ from .const import (
     PRESET_COMFORT_2,
     PRESET_VACATION,
 )
-from .entity import HeatzyEntity
+from .entity import (
+    HeatzyEntity,
+    async_get_descriptions,
+    hub_device_info,
+    index_descriptions,
+)
 
 SERVICES = [
     ["boost", {vol.Required(CONF_DELAY): cv.positive_int}, "_async_boost_mode"],
@@ -79,20 +81,12 @@ _LOGGER = logging.getLogger(__name__)
 class HeatzyClimateEntityDescription(ClimateEntityDescription):
     """Represents an Flow Sensor."""
 
-    attr_cur_temp: str | None = None
-    attr_eco_temp_high: str | None = None
-    attr_eco_temp_low: str | None = None
-    attr_temp_high: str | None = None
-    attr_temp_low: str | None = None
-    attr_stop: str = CONF_MODE
-    attr_preset: str = CONF_MODE
-    value_stop: str | int = "stop"
     fn: Callable[..., Any]
     ha_to_heatzy_state: dict[int | str, str | int | list[int]]
     heatzy_to_ha_state: dict[int | str, str]
     hvac_modes = [HVACMode.HEAT, HVACMode.OFF, HVACMode.AUTO]
     preset_modes: list[str] = field(default_factory=list)
-    products: list[str]
+    products: frozenset[str]
     supported_features: ClimateEntityFeature = (
         ClimateEntityFeature.PRESET_MODE
         | ClimateEntityFeature.TURN_ON
@@ -102,6 +96,20 @@ class HeatzyClimateEntityDescription(ClimateEntityDescription):
     temperature_unit = UnitOfTemperature.CELSIUS
 
 
+@dataclass(frozen=True, slots=True)
+class HeatzyClimateState:
+    """Climate state decoded once per update of the device."""
+
+    hvac_mode: HVACMode
+    preset_mode: str | None
+    hvac_action: HVACAction | None = None
+    current_humidity: float | None = None
+    current_temperature: float | None = None
+    target_temperature: float | None = None
+    target_temperature_high: float | None = None
+    target_temperature_low: float | None = None
+
+
 CLIMATE_TYPES = (
     HeatzyClimateEntityDescription(
         key="pilote_v1",
@@ -121,12 +129,11 @@ CLIMATE_TYPES = (
             PRESET_AWAY: [1, 1, 2],
             PRESET_NONE: [1, 1, 3],
         },
-        value_stop="\u505c\u6b62",
     ),
     HeatzyClimateEntityDescription(
         key="pilote_v2",
         translation_key="pilote_v2",
-        products=PILOTE_V2 + PILOTE_V3,
+        products=PILOTE_V2 | PILOTE_V3,
         preset_modes=[
             PRESET_COMFORT,
             PRESET_ECO,
@@ -215,12 +222,6 @@ CLIMATE_TYPES = (
             PRESET_COMFORT_2: "cft2",
             PRESET_NONE: "stop",
         },
-        attr_stop=CONF_ON_OFF,
-        attr_cur_temp=CUR_TEMP_L,
-        attr_temp_high=CFT_TEMP_H,
-        attr_temp_low=CFT_TEMP_L,
-        attr_eco_temp_high=ECO_TEMP_H,
-        attr_eco_temp_low=ECO_TEMP_L,
         target_temperature_step=0.1,
     ),
     HeatzyClimateEntityDescription(
@@ -259,9 +260,6 @@ CLIMATE_TYPES = (
             PRESET_COMFORT_2: "cft2",
             PRESET_NONE: "stop",
         },
-        attr_cur_temp=CONF_CUR_TEMP,
-        attr_temp_high=CONF_CFT_TEMP,
-        attr_temp_low=CONF_ECO_TEMP,
         target_temperature_step=0.1,
     ),
     HeatzyClimateEntityDescription(
@@ -300,15 +298,12 @@ CLIMATE_TYPES = (
             PRESET_COMFORT_2: "cft2",
             PRESET_NONE: "stop",
         },
-        attr_preset=CONF_CUR_MODE,
-        attr_stop=CONF_CUR_MODE,
-        attr_cur_temp=CONF_CUR_TEMP,
-        attr_temp_high=CONF_CFT_TEMP,
-        attr_temp_low=CONF_ECO_TEMP,
         target_temperature_step=0.5,
     ),
 )
 
+CLIMATE_INDEX = index_descriptions(CLIMATE_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -322,12 +317,16 @@ async def async_setup_entry(
     for service in SERVICES:
         platform.async_register_entity_service(*service)
 
-    entities: list[HeatzyThermostat] = []
-    for unique_id, device in coordinator.data.items():
-        product_key = device.get(CONF_PRODUCT_KEY)
-        for description in CLIMATE_TYPES:
-            if product_key in description.products:
-                entities.extend([description.fn(coordinator, description, unique_id)])
+    entities: list[ClimateEntity] = [
+        description.fn(coordinator, description, unique_id)
+        for unique_id, device in coordinator.data.items()
+        for description in async_get_descriptions(CLIMATE_INDEX, device)
+    ]
+
+    thermostats = {entity.device_id: entity for entity in entities}
+    for name, dids in entry.options.get(CONF_ZONES, {}).items():
+        if members := [thermostats[did] for did in dids if did in thermostats]:
+            entities.append(HeatzyZone(coordinator, name, members))
 
     async_add_entities(entities)
 
@@ -337,6 +336,9 @@ class HeatzyThermostat(HeatzyEntity, ClimateEntity):
 
     _attr_name = None
     _enable_turn_on_off_backwards_compatibility = False
+    # Presets targeting the frost protection temperature
+    _frost_presets: frozenset[str] = frozenset()
+    _climate_state: HeatzyClimateState
     entity_description: HeatzyClimateEntityDescription
 
     def __init__(
@@ -352,48 +354,137 @@ class HeatzyThermostat(HeatzyEntity, ClimateEntity):
         self._attr_supported_features = description.supported_features
         self._attr_preset_modes = description.preset_modes
         self._attr_hvac_modes = description.hvac_modes
-        self._attr_available = coordinator.data[did].get(CONF_IS_ONLINE, True)
+        self._attr_available = self._device_state.is_online
+
+    @callback
+    def _update_device(self) -> None:
+        """Read the device and decode its climate state."""
+        super()._update_device()
+        self._climate_state = self._decode_state()
+
+    @callback
+    def async_get_climate_state(self) -> HeatzyClimateState:
+        """Return the climate state decoded from the last frame of the device."""
+        if self._device_state is not self.coordinator.async_get_state(self.device_id):
+            self._update_device()
+        return self._climate_state
+
+    def _decode_state(self) -> HeatzyClimateState:
+        """Decode the attributes of the device."""
+        hvac_mode = self._decode_hvac_mode()
+        preset_mode = self._decode_preset_mode()
+        current_temperature = self._device_state.current_temperature
+        temperature_low, temperature_high = self._decode_temperatures(preset_mode)
 
-    @property
-    def hvac_action(self) -> HVACAction | None:
+        # Target temp is set to Low/High/Away value according to the current [preset] mode
+        target_temperature: float | None = None
+        if hvac_mode != HVACMode.OFF:
+            if preset_mode == PRESET_ECO:
+                target_temperature = temperature_low
+            elif preset_mode == PRESET_COMFORT:
+                target_temperature = temperature_high
+            elif preset_mode in self._frost_presets:
+                target_temperature = FROST_TEMP
+
+        return HeatzyClimateState(
+            hvac_mode=hvac_mode,
+            preset_mode=preset_mode,
+            hvac_action=self._decode_hvac_action(
+                hvac_mode, current_temperature, target_temperature
+            ),
+            current_humidity=self._device_state.current_humidity,
+            current_temperature=current_temperature,
+            target_temperature=target_temperature,
+            target_temperature_high=temperature_high,
+            target_temperature_low=temperature_low,
+        )
+
+    def _decode_hvac_action(
+        self,
+        hvac_mode: HVACMode,
+        current_temperature: float | None,
+        target_temperature: float | None,
+    ) -> HVACAction:
         """Return hvac action ie. heating, off mode."""
-        if self.hvac_mode == HVACMode.OFF:
+        if hvac_mode == HVACMode.OFF:
             return HVACAction.OFF
         if (
-            self.current_temperature
-            and self.target_temperature
-            and (self.current_temperature > self.target_temperature)
+            current_temperature
+            and target_temperature
+            and (current_temperature > target_temperature)
         ):
             return HVACAction.OFF
         return HVACAction.HEATING
 
-    @property
-    def hvac_mode(self) -> HVACMode:
+    def _decode_hvac_mode(self) -> HVACMode:
         """Return hvac mode ie. heat, auto, off."""
-        if self._attrs.get(CONF_TIMER_SWITCH) == 1:
+        if self._device_state.timer:
             return HVACMode.AUTO
-        if self._attrs.get(CONF_DEROG_MODE) == 1:
-            return HVACMode.AUTO        
-        if (
-            self._attrs.get(self.entity_description.attr_stop)
-            == self.entity_description.value_stop
-        ):
+        if self._device_state.derog_mode == 1:
+            return HVACMode.AUTO
+        if self._device_state.stopped:
             return HVACMode.OFF
 
         return HVACMode.HEAT
 
-    @property
-    def preset_mode(self) -> str | None:
+    def _decode_preset_mode(self) -> str | None:
         """Return the current preset mode, e.g., home, away, temp."""
-        if self._attrs.get(CONF_DEROG_MODE) == 1:
+        if self._device_state.derog_mode == 1:
             return PRESET_VACATION
-        if self._attrs.get(CONF_DEROG_MODE) == 2:
+        if self._device_state.derog_mode == 2:
             return PRESET_BOOST
 
-        return self.entity_description.heatzy_to_ha_state.get(
-            self._attrs.get(self.entity_description.attr_preset)
+        return self.entity_description.heatzy_to_ha_state.get(self._device_state.mode)
+
+    def _decode_temperatures(
+        self, preset_mode: str | None
+    ) -> tuple[float | None, float | None]:
+        """Return eco and comfort temperatures."""
+        return (
+            self._device_state.eco_temperature,
+            self._device_state.comfort_temperature,
         )
 
+    @property
+    def hvac_action(self) -> HVACAction | None:
+        """Return hvac action ie. heating, off mode."""
+        return self._climate_state.hvac_action
+
+    @property
+    def hvac_mode(self) -> HVACMode:
+        """Return hvac mode ie. heat, auto, off."""
+        return self._climate_state.hvac_mode
+
+    @property
+    def preset_mode(self) -> str | None:
+        """Return the current preset mode, e.g., home, away, temp."""
+        return self._climate_state.preset_mode
+
+    @property
+    def current_humidity(self) -> float | None:
+        """Return current humidity."""
+        return self._climate_state.current_humidity
+
+    @property
+    def current_temperature(self) -> float | None:
+        """Return current temperature."""
+        return self._climate_state.current_temperature
+
+    @property
+    def target_temperature(self) -> float | None:
+        """Return target temperature for mode."""
+        return self._climate_state.target_temperature
+
+    @property
+    def target_temperature_high(self) -> float | None:
+        """Return comfort temperature."""
+        return self._climate_state.target_temperature_high
+
+    @property
+    def target_temperature_low(self) -> float | None:
+        """Return eco temperature."""
+        return self._climate_state.target_temperature_low
+
     async def async_turn_on(self) -> None:
         """Turn device on."""
         await self._async_derog_mode_off()
@@ -425,7 +516,7 @@ class HeatzyThermostat(HeatzyEntity, ClimateEntity):
         if await self._async_derog_mode_action(preset_mode) is False:
             mode = self.entity_description.ha_to_heatzy_state.get(preset_mode)
             config = {CONF_ATTRS: {CONF_MODE: mode}}
-            if self._attrs.get(CONF_DEROG_MODE, 0) > 0:
+            if self._device_state.derog_mode > 0:
                 config[CONF_ATTRS].update({CONF_DEROG_MODE: 0, CONF_DEROG_TIME: 0})
             await self._handle_action(config, f"Error preset mode: {preset_mode}")
 
@@ -438,10 +529,7 @@ class HeatzyThermostat(HeatzyEntity, ClimateEntity):
 
     async def _async_derog_mode_off(self) -> None:
         """Disable derog mode."""
-        if (
-            self._attrs.get(CONF_DEROG_MODE, 0) > 0
-            or self._attrs.get(CONF_TIMER_SWITCH, 0) == 1
-        ):
+        if self._device_state.derog_mode > 0 or self._device_state.timer:
             await self._handle_action(
                 {
                     CONF_ATTRS: {
@@ -458,23 +546,23 @@ class HeatzyThermostat(HeatzyEntity, ClimateEntity):
             return False
 
         if derog_mode == PRESET_VACATION:
-            days = self._device.get("vacation", DEFAULT_VACATION)
+            days = self._get_setting(ATTR_VACATION, DEFAULT_VACATION)
             await self._async_vacation_mode(int(days))
         if derog_mode == PRESET_BOOST:
-            minutes = self._device.get("boost", DEFAULT_BOOST)
+            minutes = self._get_setting(ATTR_BOOST, DEFAULT_BOOST)
             await self._async_boost_mode(int(minutes))
 
         return True
 
     async def _async_vacation_mode(self, delay: int) -> None:
         """Service Vacation Mode."""
-        if value := self._get_state_by_name("Vacation"):
+        if value := self._get_setting(ATTR_VACATION):
             delay = int(float(value))
         await self._async_derog_mode(1, delay)
 
     async def _async_boost_mode(self, delay: int) -> None:
         """Service Boost Mode."""
-        if value := self._get_state_by_name("Boost"):
+        if value := self._get_setting(ATTR_BOOST):
             delay = int(float(value))
         await self._async_derog_mode(2, delay)
 
@@ -482,21 +570,9 @@ class HeatzyThermostat(HeatzyEntity, ClimateEntity):
         """Presence detection derog."""
         return await self._async_derog_mode(3)
 
-    def _get_state_by_name(self, original_name: str) -> Any:
-        """Get state for a entity."""
-        entity_reg = er.async_get(self.hass)
-        if self.device_entry is None or self.device_entry.id is None:
-            return None
-        entities = er.async_entries_for_device(entity_reg, self.device_entry.id)
-        try:
-            entity = next(
-                entity for entity in entities if entity.original_name == original_name
-            )
-            states = self.hass.states.get(entity.entity_id)
-            if states is not None and hasattr(states, "state"):
-                return states.state
-        except StopIteration:
-            return None
+    def _get_setting(self, key: str, default: Any = None) -> Any:
+        """Get a setting of the device, set by its number entities."""
+        return self.coordinator.settings.async_get(self.device_id, key, default)
 
 
 class HeatzyPiloteV1Thermostat(HeatzyThermostat):
@@ -522,71 +598,25 @@ class HeatzyPiloteV1Thermostat(HeatzyThermostat):
 class Glowv1Thermostat(HeatzyThermostat):
     """Glow, Onyx, Inea."""
 
-    @property
-    def current_temperature(self) -> float:
-        """Return current temperature."""
-        return self._attrs.get(self.entity_description.attr_cur_temp, 0) / 10
-
-    @property
-    def target_temperature_high(self) -> float:
-        """Return comfort temperature."""
-        cft_tempH = self._attrs.get(self.entity_description.attr_temp_high, 0)
-        cft_tempL = self._attrs.get(self.entity_description.attr_temp_low, 0)
-
-        if self.preset_mode in {PRESET_AWAY, PRESET_VACATION}:
-            cft_tempH = 0
-            cft_tempL = FROST_TEMP * 10
-
-        return (cft_tempL + (cft_tempH * 256)) / 10
-
-    @property
-    def target_temperature_low(self) -> float:
-        """Return comfort temperature."""
-        eco_tempH = self._attrs.get(self.entity_description.attr_eco_temp_high, 0)
-        eco_tempL = self._attrs.get(self.entity_description.attr_eco_temp_low, 0)
-
-        if self.preset_mode in {PRESET_AWAY, PRESET_VACATION}:
-            eco_tempH = 0
-            eco_tempL = FROST_TEMP * 10
+    _frost_presets = frozenset({PRESET_AWAY, PRESET_VACATION})
 
-        return (eco_tempL + (eco_tempH * 256)) / 10
+    def _decode_temperatures(
+        self, preset_mode: str | None
+    ) -> tuple[float | None, float | None]:
+        """Return eco and comfort temperatures."""
+        if preset_mode in self._frost_presets:
+            return FROST_TEMP, FROST_TEMP
+        return super()._decode_temperatures(preset_mode)
 
-    @property
-    def hvac_action(self) -> HVACAction:
-        """Return hvac action ie. heating, off mode."""
-        if self.hvac_mode == HVACMode.OFF:
-            return HVACAction.OFF
-        if self.target_temperature and (
-            self.current_temperature > self.target_temperature
-        ):
-            return HVACAction.OFF
-        return HVACAction.HEATING
-
-    @property
-    def hvac_mode(self) -> HVACMode:
+    def _decode_hvac_mode(self) -> HVACMode:
         """Return hvac operation ie. heat, cool mode."""
-        if self._attrs.get(CONF_ON_OFF) == 0:
+        if self._device_state.stopped:
             return HVACMode.OFF
-        if self._attrs.get(CONF_DEROG_MODE) == 1:
+        if self._device_state.derog_mode == 1:
             return HVACMode.AUTO
 
         return HVACMode.HEAT
 
-    @property
-    def target_temperature(self) -> float | None:
-        """Return target temperature for mode."""
-        # Target temp is set to Low/High/Away value according to the current [preset] mode
-        if self.hvac_mode == HVACMode.OFF:
-            return None
-        if self.preset_mode == PRESET_ECO:
-            return self.target_temperature_low
-        if self.preset_mode == PRESET_COMFORT:
-            return self.target_temperature_high
-        if self.preset_mode in {PRESET_AWAY, PRESET_VACATION}:
-            return FROST_TEMP
-
-        return None
-
     async def async_turn_on(self) -> None:
         """Turn device on."""
         config = {CONF_ATTRS: {CONF_ON_OFF: True, CONF_DEROG_MODE: 0}}
@@ -632,34 +662,7 @@ class Glowv1Thermostat(HeatzyThermostat):
 class Bloomv1Thermostat(HeatzyThermostat):
     """Bloom."""
 
-    @property
-    def current_temperature(self) -> float:
-        """Return current temperature."""
-        return self._attrs.get(self.entity_description.attr_cur_temp)
-
-    @property
-    def target_temperature_high(self) -> float:
-        """Return comfort temperature."""
-        return self._attrs.get(self.entity_description.attr_temp_high)
-
-    @property
-    def target_temperature_low(self) -> float:
-        """Return echo temperature."""
-        return self._attrs.get(self.entity_description.attr_temp_low)
-
-    @property
-    def target_temperature(self) -> float | None:
-        """Return target temperature for mode."""
-        # Target temp is set to value according to the current [preset] mode
-        if self.hvac_mode == HVACMode.OFF:
-            return None
-        if self.preset_mode == PRESET_ECO:
-            return self.target_temperature_low
-        if self.preset_mode == PRESET_COMFORT:
-            return self.target_temperature_high
-        if self.preset_mode == PRESET_AWAY:
-            return FROST_TEMP
-        return None
+    _frost_presets = frozenset({PRESET_AWAY})
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
@@ -675,73 +678,39 @@ class Bloomv1Thermostat(HeatzyThermostat):
 class HeatzyPiloteProV1(HeatzyThermostat):
     """Heatzy Pilote Pro."""
 
-    @property
-    def current_humidity(self) -> float:
-        """Return current humidity."""
-        return self._attrs.get(CONF_HUMIDITY)
-
-    @property
-    def current_temperature(self) -> float:
-        """Return current temperature."""
-        return self._attrs.get(self.entity_description.attr_cur_temp, 0) / 10
-
-    @property
-    def target_temperature_high(self) -> float:
-        """Return comfort temperature."""
-        return self._attrs.get(self.entity_description.attr_temp_high, 0) / 10
-
-    @property
-    def target_temperature_low(self) -> float:
-        """Return echo temperature."""
-        return self._attrs.get(self.entity_description.attr_temp_low, 0) / 10
-
-    @property
-    def target_temperature(self) -> float | None:
-        """Return target temperature for mode."""
-        if self.hvac_mode == HVACMode.OFF:
-            return None
-        if self.preset_mode == PRESET_ECO:
-            return self.target_temperature_low
-        if self.preset_mode == PRESET_COMFORT:
-            return self.target_temperature_high
-        if self.preset_mode == PRESET_AWAY:
-            return FROST_TEMP
-        return None
+    _frost_presets = frozenset({PRESET_AWAY})
 
-    @property
-    def hvac_action(self) -> HVACAction:
+    def _decode_hvac_action(
+        self,
+        hvac_mode: HVACMode,
+        current_temperature: float | None,
+        target_temperature: float | None,
+    ) -> HVACAction:
         """Return hvac action ie. heating, off mode."""
-        if self.hvac_mode == HVACMode.OFF:
-            return HVACAction.OFF
-        if self._attrs.get(CONF_HEATING_STATE) == 1:
-            return HVACAction.OFF
-        if self.target_temperature and (
-            self.current_temperature > self.target_temperature
-        ):
+        if hvac_mode != HVACMode.OFF and self._device_state.heating:
             return HVACAction.OFF
-        return HVACAction.HEATING
+        return super()._decode_hvac_action(
+            hvac_mode, current_temperature, target_temperature
+        )
 
-    @property
-    def hvac_mode(self) -> HVACMode:
+    def _decode_hvac_mode(self) -> HVACMode:
         """Return hvac mode ie. heat, auto, off."""
-        if self._attrs.get(CONF_TIMER_SWITCH) == 1:
+        if self._device_state.timer:
             return HVACMode.AUTO
-        if self._attrs.get(CONF_DEROG_MODE) in (1,3):
+        if self._device_state.derog_mode in (1, 3):
             return HVACMode.AUTO
-        if (
-            self._attrs.get(self.entity_description.attr_stop)
-            == self.entity_description.value_stop
-        ):
+        if self._device_state.stopped:
             return HVACMode.OFF
 
         return HVACMode.HEAT
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return device state attributes."""
-        return {
-            'current_mode': self._attrs.get(self.entity_description.attr_preset),
-            'current_signal': self._attrs.get(CONF_CUR_SIGNAL)
+    @callback
+    def _update_device(self) -> None:
+        """Read the device and decode its state attributes."""
+        super()._update_device()
+        self._attr_extra_state_attributes = {
+            "current_mode": self._device_state.mode,
+            "current_signal": self._device_state.signal,
         }
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
@@ -756,3 +725,153 @@ class HeatzyPiloteProV1(HeatzyThermostat):
                 }
             }
             await self._handle_action(config, "Error to set temperature")
+
+
+class HeatzyZone(CoordinatorEntity[HeatzyDataUpdateCoordinator], ClimateEntity):
+    """Heating zone, controls its thermostats as one unit."""
+
+    _attr_has_entity_name = True
+    _attr_supported_features = (
+        ClimateEntityFeature.PRESET_MODE
+        | ClimateEntityFeature.TURN_ON
+        | ClimateEntityFeature.TURN_OFF
+    )
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _enable_turn_on_off_backwards_compatibility = False
+
+    def __init__(
+        self,
+        coordinator: HeatzyDataUpdateCoordinator,
+        name: str,
+        members: list[HeatzyThermostat],
+    ) -> None:
+        """Init."""
+        super().__init__(coordinator)
+        entry = coordinator.entry
+        self._attr_name = name
+        self._attr_unique_id = f"{entry.entry_id}_zone_{slugify(name)}"
+        self._attr_device_info = hub_device_info(entry)
+        # Modes supported by all the members
+        self._attr_preset_modes = [
+            mode
+            for mode in members[0].preset_modes or []
+            if all(mode in (member.preset_modes or []) for member in members)
+        ]
+        self._attr_hvac_modes = [
+            mode
+            for mode in members[0].hvac_modes
+            if all(mode in member.hvac_modes for member in members)
+        ]
+        self._members = {member.device_id: member for member in members}
+        self._states: dict[str, HeatzyClimateState] = {}
+        self._presets: Counter[str | None] = Counter()
+        self._modes: Counter[HVACMode] = Counter()
+        self._heating = 0
+        for did in self._members:
+            self._async_update_member(did)
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to the updates of the members."""
+        await super().async_added_to_hass()
+        for did in self._members:
+            self.async_on_remove(
+                self.coordinator.async_add_device_listener(
+                    did, partial(self._async_member_changed, did)
+                )
+            )
+
+    @callback
+    def _async_update_member(self, did: str) -> None:
+        """Replace the contribution of a member to the state of the zone."""
+        state = self._members[did].async_get_climate_state()
+        if (previous := self._states.get(did)) is not None:
+            self._presets[previous.preset_mode] -= 1
+            self._modes[previous.hvac_mode] -= 1
+            self._heating -= previous.hvac_action == HVACAction.HEATING
+        self._states[did] = state
+        self._presets[state.preset_mode] += 1
+        self._modes[state.hvac_mode] += 1
+        self._heating += state.hvac_action == HVACAction.HEATING
+
+    @callback
+    def _async_member_changed(self, did: str) -> None:
+        """Handle the update of a single member."""
+        self._async_update_member(did)
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, counted by the coordinator."""
+        self.coordinator.counters.state_writes += 1
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        for did in self._members:
+            self._async_update_member(did)
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Return True if a member is available."""
+        return any(member.available for member in self._members.values())
+
+    @property
+    def hvac_action(self) -> HVACAction:
+        """Return heating if a member is heating."""
+        return HVACAction.HEATING if self._heating else HVACAction.OFF
+
+    @property
+    def hvac_mode(self) -> HVACMode | None:
+        """Return the hvac mode of most members."""
+        return self._modes.most_common(1)[0][0]
+
+    @property
+    def preset_mode(self) -> str | None:
+        """Return the preset mode of most members."""
+        return self._presets.most_common(1)[0][0]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the members and their temperature range."""
+        temperatures = [
+            state.current_temperature
+            for state in self._states.values()
+            if state.current_temperature is not None
+        ]
+        return {
+            "entity_id": [member.entity_id for member in self._members.values()],
+            "min_temperature": min(temperatures, default=None),
+            "max_temperature": max(temperatures, default=None),
+        }
+
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        """Set the hvac mode of all the members."""
+        await asyncio.gather(
+            *(
+                member.async_set_hvac_mode(hvac_mode)
+                for member in self._members.values()
+            )
+        )
+
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        """Set the preset mode of all the members."""
+        await asyncio.gather(
+            *(
+                member.async_set_preset_mode(preset_mode)
+                for member in self._members.values()
+            )
+        )
+
+    async def async_turn_on(self) -> None:
+        """Turn all the members on."""
+        await asyncio.gather(
+            *(member.async_turn_on() for member in self._members.values())
+        )
+
+    async def async_turn_off(self) -> None:
+        """Turn all the members off."""
+        await asyncio.gather(
+            *(member.async_turn_off() for member in self._members.values())
+        )
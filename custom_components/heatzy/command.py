@@ -0,0 +1,154 @@
+"""Commands sent to the Heatzy devices."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from heatzypy import HeatzyException
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    COMMAND_BURST,
+    COMMAND_CONCURRENCY,
+    COMMAND_RATE,
+    CONF_ATTRS,
+    DEBOUNCE_COOLDOWN,
+)
+from .metrics import RuntimeCounters
+
+_LOGGER = logging.getLogger(__name__)
+
+type SendCallable = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+
+class TokenBucket:
+    """Limit the rate of the commands sent to the cloud."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialize the bucket, full."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(self) -> None:
+        """Wait for a token, in the order of the calls."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HeatzyCommandQueue:
+    """Coalesce and schedule the commands sent to each device."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        counters: RuntimeCounters | None = None,
+        on_sent: Callable[[str], None] | None = None,
+        on_success: Callable[[str], None] | None = None,
+        on_failure: Callable[[str], None] | None = None,
+    ) -> None:
+        """Initialize the queue.
+
+        on_sent is called with a device when its frame is written, on_success
+        once it is sent and on_failure when the device could not be reached.
+        """
+        self.hass = hass
+        self.entry = entry
+        self.counters = counters or RuntimeCounters()
+        self.on_sent = on_sent
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.cooldown: float = DEBOUNCE_COOLDOWN
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._errors: dict[str, list[str]] = {}
+        self._bucket = TokenBucket(COMMAND_RATE, COMMAND_BURST)
+        self._semaphore = asyncio.Semaphore(COMMAND_CONCURRENCY)
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def async_send(
+        self,
+        did: str,
+        config: dict[str, Any],
+        send: SendCallable,
+        error_msg: str = "Error unknown",
+    ) -> None:
+        """Send a command, merged with the pending commands of the device."""
+        attrs = config.get(CONF_ATTRS)
+        if not self.cooldown or attrs is None:
+            await self._async_send(did, config, send, [error_msg])
+            return
+
+        if (pending := self._pending.get(did)) is not None:
+            # Last writer wins for each attribute
+            pending.update(attrs)
+            self._errors[did].append(error_msg)
+            return
+
+        self._pending[did] = dict(attrs)
+        self._errors[did] = [error_msg]
+        self.entry.async_create_background_task(
+            self.hass, self._async_flush(did, send), f"heatzy-command-{did}"
+        )
+
+    async def _async_flush(self, did: str, send: SendCallable) -> None:
+        """Send the pending commands of a device at the end of the window."""
+        await asyncio.sleep(self.cooldown)
+        attrs = self._pending.pop(did)
+        errors = self._errors.pop(did)
+        await self._async_send(did, {CONF_ATTRS: attrs}, send, errors)
+
+    async def async_send_now(
+        self, did: str, config: dict[str, Any], send: SendCallable
+    ) -> None:
+        """Send a frame to the device, without coalescing, errors are raised.
+
+        Frames are sent in order for a device, a few devices at a time and
+        within the rate accepted by the cloud for the account.
+        """
+        async with self._locks[did], self._semaphore:
+            await self._bucket.async_acquire()
+            _LOGGER.debug("Send command (%s): %s", did, config)
+            if self.on_sent:
+                # Before the write, the echo may arrive while it is awaited
+                self.on_sent(did)
+            try:
+                await send(did, config)
+            except HeatzyException:
+                self.counters.command_failures += 1
+                if self.on_failure:
+                    self.on_failure(did)
+                raise
+            self.counters.command_successes += 1
+            if self.on_success:
+                self.on_success(did)
+
+    async def _async_send(
+        self,
+        did: str,
+        config: dict[str, Any],
+        send: SendCallable,
+        errors: list[str],
+    ) -> None:
+        """Send a frame to the device, log the errors."""
+        try:
+            await self.async_send_now(did, config, send)
+        except HeatzyException as error:
+            _LOGGER.error("%s (%s)", ", ".join(dict.fromkeys(errors)), error)
@@ -6,10 +6,13 @@ import voluptuous as vol
 from heatzypy import HeatzyClient
 from heatzypy.exception import AuthenticationFailed, HeatzyException, HttpRequestFailed
 from homeassistant import config_entries
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_DEVICES, CONF_NAME, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
-from .const import DOMAIN
+from .const import CONF_ALIAS, CONF_ZONES, DOMAIN
 
 DATA_SCHEMA = vol.Schema(
     {vol.Required(CONF_USERNAME): str, vol.Required(CONF_PASSWORD): str}
@@ -21,6 +24,14 @@ class HeatzyFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> HeatzyOptionsFlowHandler:
+        """Get option flow."""
+        return HeatzyOptionsFlowHandler()
+
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
         errors = {}
@@ -48,3 +59,51 @@ class HeatzyFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=DATA_SCHEMA, errors=errors
         )
+
+
+class HeatzyOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the heating zones."""
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the zones."""
+        if self.config_entry.state is not config_entries.ConfigEntryState.LOADED:
+            return self.async_abort(reason="not_loaded")
+
+        menu_options = ["add_zone"]
+        if self.config_entry.options.get(CONF_ZONES):
+            menu_options.append("remove_zone")
+        return self.async_show_menu(step_id="init", menu_options=menu_options)
+
+    async def async_step_add_zone(self, user_input=None) -> FlowResult:
+        """Add a zone, or change its devices."""
+        zones = dict(self.config_entry.options.get(CONF_ZONES, {}))
+        if user_input:
+            zones[user_input[CONF_NAME]] = user_input[CONF_DEVICES]
+            return self.async_create_entry(
+                data={**self.config_entry.options, CONF_ZONES: zones}
+            )
+
+        devices = {
+            did: device.get(CONF_ALIAS, did)
+            for did, device in self.config_entry.runtime_data.data.items()
+        }
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME): str,
+                vol.Required(CONF_DEVICES): cv.multi_select(devices),
+            }
+        )
+        return self.async_show_form(step_id="add_zone", data_schema=schema)
+
+    async def async_step_remove_zone(self, user_input=None) -> FlowResult:
+        """Remove zones."""
+        zones = dict(self.config_entry.options.get(CONF_ZONES, {}))
+        if user_input:
+            for name in user_input[CONF_ZONES]:
+                zones.pop(name, None)
+            return self.async_create_entry(
+                data={**self.config_entry.options, CONF_ZONES: zones}
+            )
+
+        schema = vol.Schema({vol.Required(CONF_ZONES): cv.multi_select(list(zones))})
+        return self.async_show_form(step_id="remove_zone", data_schema=schema)
@@ -5,6 +5,9 @@ ATTR_BOOST = "boost"
 ATTR_VACATION = "vacation"
 CFT_TEMP_H = "cft_tempH"
 CFT_TEMP_L = "cft_tempL"
+COMMAND_BURST = 10
+COMMAND_CONCURRENCY = 4
+COMMAND_RATE = 5
 CONF_ALIAS = "dev_alias"
 CONF_ATTRS = "attrs"
 CONF_CFT_TEMP = "cft_temp"
@@ -27,45 +30,87 @@ CONF_PRODUCT_KEY = "product_key"
 CONF_TIMER_SWITCH = "timer_switch"
 CONF_VERSION = "wifi_soft_version"
 CONF_WINDOW = "window_switch"
+CONF_ZONES = "zones"
 CUR_TEMP_H = "cur_tempH"
 CUR_TEMP_L = "cur_tempL"
-DEBOUNCE_COOLDOWN = 10
+DEBOUNCE_COOLDOWN = 0.5
 DOMAIN = "heatzy"
 DEFAULT_BOOST = 60
 DEFAULT_VACATION = 30
 ECO_TEMP_H = "eco_tempH"
 ECO_TEMP_L = "eco_tempL"
 FROST_TEMP = 7
-PLATFORMS = ["binary_sensor", "climate", "number", "switch"]
+PLATFORMS = ["binary_sensor", "climate", "number", "sensor", "switch"]
 PRESET_COMFORT_1 = "Comfort 1"
 PRESET_COMFORT_2 = "Comfort 2"
 PRESET_VACATION = "Vacation"
 
-PILOTE_V1 = ["9420ae048da545c88fc6274d204dd25f"]
-PILOTE_V2 = [
-    "51d16c22a5f74280bc3cfe9ebcdc6402",  # PILOTE2
-    "4fc968a21e7243b390e9ede6f1c6465d",  # PILOTE2_ELEC_PRO
-]
-PILOTE_V3 = [
-    "b9a67b6ce24b437d9794103fd317e627",  # PILOTE_SOC
-    "b8c6657b66c34148b4dee64d615cefc7",  # ELEC_PRO_SOC
-]
-PILOTE_V4 = [
-    "9dacde7ef459421eaf8dc4bea9385634",  # ELEC_PRO_BLE
-    "46409c7f29d4411c85a3a46e5ee3703e",  # Sauter PILOTE_SOC_C3
-]
-PILOTE_PRO_V1 = [
-    "a77a929fcf0d4631bc4f669080376891",  # Pilote Pro
-]
-GLOW = [
-    "2fd622e45283470f9e27e8e6167d7533",  # GLOW_SIMPLE
-    "bb10d064f8de409db633b750faa22a52",  # ONYX
-    "fc89066ee74c4149a9beb37d4ea93604",  # INEA
-]
-BLOOM = ["480253852d574f11b2d7fbf4460d7a41"]  # BLOOM
+PILOTE_V1 = frozenset({"9420ae048da545c88fc6274d204dd25f"})
+PILOTE_V2 = frozenset(
+    {
+        "51d16c22a5f74280bc3cfe9ebcdc6402",  # PILOTE2
+        "4fc968a21e7243b390e9ede6f1c6465d",  # PILOTE2_ELEC_PRO
+    }
+)
+PILOTE_V3 = frozenset(
+    {
+        "b9a67b6ce24b437d9794103fd317e627",  # PILOTE_SOC
+        "b8c6657b66c34148b4dee64d615cefc7",  # ELEC_PRO_SOC
+    }
+)
+PILOTE_V4 = frozenset(
+    {
+        "9dacde7ef459421eaf8dc4bea9385634",  # ELEC_PRO_BLE
+        "46409c7f29d4411c85a3a46e5ee3703e",  # Sauter PILOTE_SOC_C3
+    }
+)
+PILOTE_PRO_V1 = frozenset(
+    {
+        "a77a929fcf0d4631bc4f669080376891",  # Pilote Pro
+    }
+)
+GLOW = frozenset(
+    {
+        "2fd622e45283470f9e27e8e6167d7533",  # GLOW_SIMPLE
+        "bb10d064f8de409db633b750faa22a52",  # ONYX
+        "fc89066ee74c4149a9beb37d4ea93604",  # INEA
+    }
+)
+BLOOM = frozenset({"480253852d574f11b2d7fbf4460d7a41"})  # BLOOM
 
-ALL_WO_V1 = PILOTE_V2 + PILOTE_V3 + PILOTE_V4 + GLOW + BLOOM + PILOTE_PRO_V1
-ALL = PILOTE_V1 + ALL_WO_V1
+ALL_WO_V1 = PILOTE_V2 | PILOTE_V3 | PILOTE_V4 | GLOW | BLOOM | PILOTE_PRO_V1
+ALL = PILOTE_V1 | ALL_WO_V1
+
+# Products with entities on each platform, the account sensors are always set up
+PLATFORM_PRODUCTS = {
+    "binary_sensor": PILOTE_PRO_V1,
+    "climate": ALL,
+    "number": ALL,
+    "switch": ALL_WO_V1,
+}
+
+# Keys redacted from the diagnostics and the captures
+TO_REDACT = {
+    "address",
+    "api_key",
+    "city",
+    "country",
+    "email",
+    "encryption_password",
+    "encryption_salt",
+    "host",
+    "imei",
+    "ip4_addr",
+    "ip6_addr",
+    "password",
+    "phone",
+    "serial",
+    "system_serial",
+    "userId",
+    "username",
+    "mac",
+    "passcode",
+}
 
 # -- Not integrated --
 # FLAM "f71ee820660f4f358db8b8a474689726"
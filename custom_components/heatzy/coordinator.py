@@ -1,22 +1,85 @@
 """Coordinator Heatzy platform."""
 
-
+import asyncio
+import itertools
 import logging
+import random
+import time
+from collections import defaultdict
+from collections.abc import Callable
 from datetime import timedelta
+from functools import partial
 from typing import Any
 
 from heatzypy import HeatzyClient
 from heatzypy.exception import AuthenticationFailed, ConnectionFailed, HeatzyException
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .command import HeatzyCommandQueue
+from .const import (
+    CONF_ALIAS,
+    CONF_ATTRS,
+    CONF_DEROG_TIME,
+    CONF_IS_ONLINE,
+    CONF_MODEL,
+    CONF_PRODUCT_KEY,
+    CONF_VERSION,
+    DOMAIN,
+    PLATFORM_PRODUCTS,
+    PLATFORMS,
+)
+from .metrics import FrameBuffer, LatencyHistogram, RuntimeCounters
+from .models import HeatzyDeviceState, decode_device
+from .recorder import FrameRecorder
+from .settings import HeatzySettings
 
 _LOGGER = logging.getLogger(__name__)
 SCAN_INTERVAL = 60
+POLL_INTERVAL_MIN = 10
+LIVENESS_INTERVAL = 300
+CONFIRM_TIMEOUT = 15
+RECONNECT_MIN = 1
+RECONNECT_MAX = 300
+RECONNECT_STABLE = 60
+SNAPSHOT_SAVE_DELAY = 60
+STORAGE_VERSION = 1
+
+# Device keys kept in the snapshot
+SNAPSHOT_KEYS = (
+    "did",
+    CONF_ALIAS,
+    CONF_ATTRS,
+    CONF_IS_ONLINE,
+    CONF_MODEL,
+    CONF_PRODUCT_KEY,
+    CONF_VERSION,
+)
+
+
+def _fingerprint(device: dict[str, Any]) -> int:
+    """Return a fingerprint of the reported state of a device."""
+    state = (device.get(CONF_IS_ONLINE), tuple((device.get(CONF_ATTRS) or {}).items()))
+    try:
+        return hash(state)
+    except TypeError:
+        # Lists in the attributes
+        return hash(repr(state))
+
+
+@callback
+def async_get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store of the last known devices."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
 
 
 class HeatzyDataUpdateCoordinator(DataUpdateCoordinator):
@@ -26,17 +89,432 @@ class HeatzyDataUpdateCoordinator(DataUpdateCoordinator):
         """Class to manage fetching Heatzy data API."""
         self.entry = entry
         self.unsub: CALLBACK_TYPE | None = None
+        self.reconnects = 0
+        self.platforms: list[str] = []
+        self.counters = RuntimeCounters()
+        self.frame_buffer = FrameBuffer()
+        self.recorder: FrameRecorder | None = None
+        self.probe: dict[str, Any] = {}
+        self.commands = HeatzyCommandQueue(
+            hass,
+            entry,
+            self.counters,
+            on_sent=self.async_command_sent,
+            on_success=self._async_notify_metrics,
+            on_failure=self.async_command_failed,
+        )
+        self._store = async_get_store(hass, entry)
+        self.states: dict[str, HeatzyDeviceState] = {}
+        self.settings = HeatzySettings(hass, entry)
+        self._device_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._metrics_listeners: list[CALLBACK_TYPE] = []
+        self._device_states: dict[str, tuple[Any, dict[str, Any]]] = {}
+        self._fingerprints: dict[str, int] = {}
+        # Receive sequence, online flag and attributes of the last frame of
+        # each device, as reported without the optimistic state
+        self._sequence = itertools.count(1)
+        self._frames: dict[str, tuple[int, Any, dict[str, Any]]] = {}
+        self._optimistic: dict[str, dict[str, Any]] = {}
+        self._optimistic_unsub: dict[str, CALLBACK_TYPE] = {}
+        self._optimistic_since: dict[str, float] = {}
+        self.latency = LatencyHistogram()
+        self.product_latency: defaultdict[str, LatencyHistogram] = defaultdict(
+            LatencyHistogram
+        )
         super().__init__(
             hass, _LOGGER, name=DOMAIN, update_interval=timedelta(seconds=SCAN_INTERVAL)
         )
 
     async def _async_setup(self) -> None:
         """Coordinator setup."""
+        await self.settings.async_load()
         self.api = HeatzyClient(
             self.entry.data[CONF_USERNAME],
             self.entry.data[CONF_PASSWORD],
             async_create_clientsession(self.hass),
         )
+        self.entry.async_on_unload(self.async_stop_capture)
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self._async_check_liveness,
+                timedelta(seconds=LIVENESS_INTERVAL),
+                cancel_on_shutdown=True,
+            )
+        )
+
+    async def async_restore(self) -> bool:
+        """Load the last known devices and refresh them in the background."""
+        if not (snapshot := await self._store.async_load()):
+            return False
+
+        await self._async_setup()
+        self.data = snapshot
+
+        async def async_refresh_snapshot() -> None:
+            """Replace the snapshot by live data."""
+            await self.async_refresh()
+            if self.last_update_success and set(self.data) - set(snapshot):
+                # Create the entities of the new devices
+                self.hass.config_entries.async_schedule_reload(self.entry.entry_id)
+
+        self.entry.async_create_background_task(
+            self.hass, async_refresh_snapshot(), "heatzy-refresh-snapshot"
+        )
+        return True
+
+    @callback
+    def async_get_platforms(self) -> list[str]:
+        """Return the platforms with entities for the devices of the account."""
+        product_keys = {device.get(CONF_PRODUCT_KEY) for device in self.data.values()}
+        return [
+            platform
+            for platform in PLATFORMS
+            if platform not in PLATFORM_PRODUCTS
+            or not product_keys.isdisjoint(PLATFORM_PRODUCTS[platform])
+        ]
+
+    @callback
+    def async_check_platforms(self) -> None:
+        """Reload when a new device needs another platform."""
+        if not self.platforms:
+            # Not set up yet
+            return
+        if set(self.async_get_platforms()) - set(self.platforms):
+            self.hass.config_entries.async_schedule_reload(self.entry.entry_id)
+
+    async def async_start_capture(self, path: str) -> None:
+        """Record the frames received from now on in a capture."""
+        await self.async_stop_capture()
+        self.recorder = FrameRecorder(self.hass, path)
+
+    async def async_stop_capture(self) -> int | None:
+        """Stop the capture, return the number of recorded frames."""
+        if (recorder := self.recorder) is None:
+            return None
+        self.recorder = None
+        await recorder.async_stop()
+        return recorder.frames
+
+    @callback
+    def is_stale(self, did: str) -> bool:
+        """Return True until live data is received for the device."""
+        return did not in self._device_states
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Save the last known devices, batched to limit disk writes."""
+
+        def snapshot() -> dict[str, Any]:
+            return {
+                did: {key: device[key] for key in SNAPSHOT_KEYS if key in device}
+                for did, device in (self.data or {}).items()
+            }
+
+        self._store.async_delay_save(snapshot, SNAPSHOT_SAVE_DELAY)
+
+    @property
+    def websocket_healthy(self) -> bool:
+        """Return True if the websocket delivers the state of all devices."""
+        return self.api.websocket.is_connected and self.api.websocket.is_updated
+
+    @callback
+    def _async_set_polling(self, enabled: bool) -> None:
+        """Suspend polling while the websocket is healthy, poll fast otherwise."""
+        if enabled == (self.update_interval is not None):
+            return
+        if enabled:
+            self.logger.debug("Websocket down, polling enabled")
+            self.update_interval = timedelta(seconds=POLL_INTERVAL_MIN)
+            if self._listeners:
+                self._schedule_refresh()
+        else:
+            self.logger.debug("Websocket healthy, polling suspended")
+            self.update_interval = None
+            self._async_unsub_refresh()
+
+    @callback
+    def _async_check_liveness(self, _: Any = None) -> None:
+        """Check the websocket, fall back to polling if it is down."""
+        if not self.unsub:
+            self._init_websocket()
+        self._async_set_polling(not self.websocket_healthy)
+        # Refresh the frame rate, even if no frame was received
+        self._async_notify_metrics()
+
+    @callback
+    def async_add_device_listener(
+        self, did: str, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for websocket updates of a single device."""
+        listeners = self._device_listeners.setdefault(did, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove update listener."""
+            listeners.remove(update_callback)
+            if not listeners:
+                self._device_listeners.pop(did, None)
+
+        return remove_listener
+
+    @callback
+    def async_add_metrics_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for changes of the counters and the latencies."""
+        self._metrics_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove update listener."""
+            self._metrics_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify_metrics(self, _: Any = None) -> None:
+        """Notify the listeners of the counters and the latencies."""
+        for update_callback in list(self._metrics_listeners):
+            update_callback()
+
+    @callback
+    def _async_device_changed(self, did: str, device: dict[str, Any]) -> bool:
+        """Return True if the device differs from the last known state."""
+        fingerprint = _fingerprint(device)
+        if self._fingerprints.get(did) == fingerprint:
+            return False
+        self._fingerprints[did] = fingerprint
+        self._device_states[did] = (
+            device.get(CONF_IS_ONLINE),
+            dict(device.get(CONF_ATTRS) or {}),
+        )
+        return True
+
+    @callback
+    def async_get_state(self, did: str) -> HeatzyDeviceState:
+        """Return the decoded state of a device, shared by all its entities."""
+        if (state := self.states.get(did)) is None:
+            state = self.states[did] = decode_device(self.data.get(did, {}))
+        return state
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Decode the devices once, then update all listeners and the metrics."""
+        self.states = {
+            did: decode_device(device) for did, device in (self.data or {}).items()
+        }
+        super().async_update_listeners()
+        self._async_notify_metrics()
+
+    @callback
+    def _async_notify_device(self, did: str) -> None:
+        """Decode the device, then notify its listeners."""
+        if self.data and did in self.data:
+            self.states[did] = decode_device(self.data[did])
+        for update_callback in list(self._device_listeners.get(did, ())):
+            update_callback()
+
+    @callback
+    def async_set_optimistic(self, did: str, attrs: dict[str, Any]) -> None:
+        """Show the commanded attributes until the device confirms them."""
+        if not self.data or (device := self.data.get(did)) is None:
+            return
+
+        # The derogation time counts down on the device, it is never echoed as is
+        self.frame_buffer.add_command(did, attrs)
+        pending = self._optimistic.setdefault(did, {})
+        pending.update({k: v for k, v in attrs.items() if k != CONF_DEROG_TIME})
+        device[CONF_ATTRS] = {**(device.get(CONF_ATTRS) or {}), **attrs}
+
+        if unsub := self._optimistic_unsub.pop(did, None):
+            unsub()
+        if pending:
+            self._optimistic_unsub[did] = async_call_later(
+                self.hass,
+                CONFIRM_TIMEOUT,
+                HassJob(
+                    partial(self._async_rollback, did),
+                    "heatzy-rollback",
+                    cancel_on_shutdown=True,
+                ),
+            )
+        else:
+            del self._optimistic[did]
+            self._optimistic_since.pop(did, None)
+        self._async_notify_device(did)
+
+    @callback
+    def _async_record_latency(self, did: str, latency: float | None) -> None:
+        """Record the round trip of a command, None if it timed out."""
+        self.frame_buffer.add_echo(did, latency)
+        product_key = (self.data or {}).get(did, {}).get(CONF_PRODUCT_KEY)
+        for histogram in (self.latency, self.product_latency[product_key]):
+            if latency is None:
+                histogram.add_timeout()
+            else:
+                histogram.add(latency)
+        self._async_notify_metrics()
+
+    @callback
+    def _async_confirm_optimistic(
+        self,
+        did: str,
+        device: dict[str, Any],
+        reported: dict[str, Any] | None = None,
+    ) -> None:
+        """Drop the confirmed attributes, keep the others over the device state.
+
+        The attributes are confirmed by the reported ones, those of the device
+        if not given. The device may already show the commanded attributes.
+        """
+        if (pending := self._optimistic.get(did)) is None:
+            return
+
+        attrs = device.get(CONF_ATTRS) or {}
+        if reported is None:
+            reported = attrs
+        for key in [k for k, value in pending.items() if reported.get(k) == value]:
+            del pending[key]
+        if pending:
+            device[CONF_ATTRS] = {**attrs, **pending}
+            return
+
+        del self._optimistic[did]
+        if unsub := self._optimistic_unsub.pop(did, None):
+            unsub()
+        # Commands confirmed before being sent have no round trip
+        if (sent := self._optimistic_since.pop(did, None)) is not None:
+            self._async_record_latency(did, time.monotonic() - sent)
+
+    @callback
+    def async_command_sent(self, did: str) -> None:
+        """Start the round trip of the commanded attributes of a device.
+
+        The clock starts when the frame is written, after the debounce window
+        and the rate limit of the queue.
+        """
+        if did in self._optimistic:
+            self._optimistic_since[did] = time.monotonic()
+
+    @callback
+    def _async_rollback(self, did: str, _: Any = None) -> None:
+        """Restore the state reported by a device which ignored a command."""
+        self._optimistic_unsub.pop(did, None)
+        if pending := self._async_restore_reported(did):
+            self._async_record_latency(did, None)
+            self.logger.error(
+                "Device %s did not confirm %s, state restored", did, pending
+            )
+
+    @callback
+    def async_command_failed(self, did: str) -> None:
+        """Restore the reported state at once, the command was not sent."""
+        if unsub := self._optimistic_unsub.pop(did, None):
+            unsub()
+        self._async_restore_reported(did)
+        self._async_notify_metrics()
+
+    @callback
+    def _async_restore_reported(self, did: str) -> dict[str, Any] | None:
+        """Drop the commanded attributes of a device, return them."""
+        self._optimistic_since.pop(did, None)
+        pending = self._optimistic.pop(did, None)
+        if not pending or not self.data or (device := self.data.get(did)) is None:
+            return None
+
+        reported = self._device_states.get(did, (None, {}))[1]
+        attrs = dict(device.get(CONF_ATTRS) or {})
+        for key in pending:
+            if key in reported:
+                attrs[key] = reported[key]
+            else:
+                attrs.pop(key, None)
+        device[CONF_ATTRS] = attrs
+        self._async_notify_device(did)
+        return pending
+
+    @callback
+    def async_set_updated_data(self, data: dict[str, Any]) -> None:
+        """Manually update data and notify all listeners."""
+        for did, device in data.items():
+            self._async_device_changed(did, device)
+            self._async_confirm_optimistic(did, device)
+        super().async_set_updated_data(data)
+        self._async_save_snapshot()
+
+    @callback
+    def _async_handle_websocket_data(self, data: dict[str, Any]) -> None:
+        """Merge a websocket frame and notify the devices that changed."""
+        if self.recorder:
+            self.recorder.async_record(data)
+        # The websocket sends a single device, the whole account otherwise.
+        devices = {data["did"]: data} if "did" in data else data
+        sequence = next(self._sequence)
+        changed = []
+        for did, device in devices.items():
+            attrs = device.get(CONF_ATTRS) or {}
+            self._frames[did] = (sequence, device.get(CONF_IS_ONLINE), attrs)
+            if self._async_device_changed(did, device):
+                changed.append(did)
+                self.frame_buffer.add_frame(did, attrs)
+            else:
+                # Heartbeats and subscriptions repeat the state, they only
+                # confirm the commands matching the attributes they report
+                self.counters.duplicates += 1
+                self.frame_buffer.async_wake(did)
+        self.counters.add_frame(len(changed))
+
+        if self.data is None:
+            self.data = {}
+        new = [did for did in changed if did not in self.data]
+        for did in changed:
+            if did in self.data and self.data[did] is not devices[did]:
+                self.data[did].update(devices[did])
+            else:
+                self.data[did] = devices[did]
+        for did, device in devices.items():
+            if did in self._optimistic:
+                # A duplicate leaves the overlay in the data, use the frame
+                self._async_confirm_optimistic(
+                    did, self.data[did], device.get(CONF_ATTRS) or {}
+                )
+
+        if self.update_interval is not None and self.websocket_healthy:
+            self._async_set_polling(False)
+
+        if not self.last_update_success:
+            # Recover availability of all entities
+            self.last_update_success = True
+            self.last_exception = None
+            self.async_update_listeners()
+            return
+
+        for did in changed:
+            self._async_notify_device(did)
+        if changed:
+            self._async_save_snapshot()
+        if new:
+            # Polling is suspended, the full listeners may never run
+            self.async_check_platforms()
+        self._async_notify_metrics()
+
+    @callback
+    def _async_merge_poll(self, devices: dict[str, Any], started: int) -> None:
+        """Keep the attributes of the frames received during the poll.
+
+        The response of a poll may be older than the frames pushed while it was
+        in flight, they are never overwritten. The values come from the frames,
+        the data may show commands not confirmed yet.
+        """
+        for did, device in devices.items():
+            sequence, is_online, frame = self._frames.get(did, (0, None, {}))
+            if sequence < started:
+                continue
+            device[CONF_ATTRS] = {**(device.get(CONF_ATTRS) or {}), **frame}
+            if is_online is not None:
+                device[CONF_IS_ONLINE] = is_online
 
     @callback
     def _init_websocket(self, event: Event | None = None) -> None:
@@ -46,10 +524,10 @@ class HeatzyDataUpdateCoordinator(DataUpdateCoordinator):
             """Create the connection and listen to the websocket."""
             try:
                 self.api.websocket.register_callback(
-                    callback=self.async_set_updated_data
+                    callback=self._async_handle_websocket_data
                 )
                 await self.api.websocket.async_connect(
-                    auto_subscribe=True, all_devices=True
+                    auto_subscribe=True, all_devices=False
                 )
                 await self.api.websocket.async_listen()
             except AuthenticationFailed as error:
@@ -61,14 +539,49 @@ class HeatzyDataUpdateCoordinator(DataUpdateCoordinator):
             except HeatzyException as error:
                 self.logger.error(error)
                 self.last_update_success = False
+            except Exception:
+                # Keep the supervisor alive on errors of the session (aiohttp...)
+                self.logger.exception("Unexpected websocket error")
+                self.last_update_success = False
             finally:
                 self.async_update_listeners()
 
             # Ensure we are disconnected
             await self.api.websocket.async_disconnect()
-            if self.unsub:
-                self.unsub()
-                self.unsub = None
+            self._async_set_polling(True)
+
+        async def async_supervisor() -> None:
+            """Keep the websocket connected, reconnect with backoff."""
+            attempt = 0
+            try:
+                while self.unsub:
+                    started = time.monotonic()
+                    try:
+                        await async_listener()
+                    except Exception:
+                        self.logger.exception("Websocket listener failed")
+                    if not self.unsub:
+                        break
+                    if time.monotonic() - started >= RECONNECT_STABLE:
+                        attempt = 0
+                    # Full jitter spreads the reconnections after a cloud outage
+                    delay = random.uniform(
+                        0, min(RECONNECT_MAX, RECONNECT_MIN * 2**attempt)
+                    )
+                    attempt += 1
+                    self.reconnects += 1
+                    self._async_notify_metrics()
+                    self.logger.debug(
+                        "Websocket reconnect #%s in %.1f seconds",
+                        self.reconnects,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+            finally:
+                # Let the liveness check start a new supervisor
+                if self.unsub:
+                    self.unsub()
+                    self.unsub = None
 
         async def close_websocket(_: Event) -> None:
             """Close WebSocket connection."""
@@ -82,17 +595,38 @@ class HeatzyDataUpdateCoordinator(DataUpdateCoordinator):
 
         # Start listening
         self.entry.async_create_background_task(
-            self.hass, async_listener(), "heatzy-listen"
+            self.hass, async_supervisor(), "heatzy-listen"
         )
 
+    async def async_stop_websocket(self) -> None:
+        """Stop the supervisor and close the websocket, safe to call twice."""
+        if unsub := self.unsub:
+            self.unsub = None
+            unsub()
+        await self.api.websocket.async_disconnect()
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data."""
         if not self.api.websocket.is_connected and not self.unsub:
             self._init_websocket()
 
+        if not self.websocket_healthy and self.update_interval is not None:
+            # Decay the polling cadence while the websocket is down
+            self.update_interval = min(
+                self.update_interval * 2, timedelta(seconds=SCAN_INTERVAL)
+            )
+
         try:
-            if not self.api.websocket.is_updated:
-                return await self.api.async_get_devices()
+            if not self.websocket_healthy:
+                self.counters.polls += 1
+                started = next(self._sequence)
+                devices = await self.api.async_get_devices()
+                self._async_merge_poll(devices, started)
+                for did, device in devices.items():
+                    self._async_device_changed(did, device)
+                    self._async_confirm_optimistic(did, device)
+                self._async_save_snapshot()
+                return devices
         except HeatzyException as error:
             raise UpdateFailed(f"Invalid response from API: {error}") from error
         else:
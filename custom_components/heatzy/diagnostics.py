@@ -3,39 +3,69 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_ATTRS, CONF_MODE
+from .const import CONF_ATTRS, CONF_IS_ONLINE, CONF_MODE, TO_REDACT
+from .coordinator import HeatzyDataUpdateCoordinator
 
-# Delay (in seconds) to let the websocket push the callbacks triggered by the
-# control commands before unregistering our listener.
-CALLBACK_WAIT = 3
+# Seconds to wait for the echoes of the probe
+PROBE_TIMEOUT = 10
 
-TO_REDACT = {
-    "address",
-    "api_key",
-    "city",
-    "country",
-    "email",
-    "encryption_password",
-    "encryption_salt",
-    "host",
-    "imei",
-    "ip4_addr",
-    "ip6_addr",
-    "password",
-    "phone",
-    "serial",
-    "system_serial",
-    "userId",
-    "username",
-    "mac",
-    "passcode",
-}
+
+async def async_probe(coordinator: HeatzyDataUpdateCoordinator) -> dict[str, Any]:
+    """Probe the online devices without a frame in the buffer, in parallel.
+
+    Run on demand by the probe service, the downloads stay passive. The current
+    mode is written again, so the heaters do not change. The commands share the
+    rate limit of the account, the probe ends when all the echoes arrived or
+    after the timeout.
+    """
+    devices = coordinator.data or {}
+    buffer = coordinator.frame_buffer
+    seen = buffer.dids
+    targets = {
+        did: mode
+        for did, device in devices.items()
+        if did not in seen
+        and device.get(CONF_IS_ONLINE, True)
+        and (mode := (device.get(CONF_ATTRS) or {}).get(CONF_MODE)) is not None
+    }
+    if not targets:
+        return {}
+
+    echoes = {did: buffer.async_wait_frame(did) for did in targets}
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(
+            coordinator.commands.async_send_now(
+                did,
+                {CONF_ATTRS: {CONF_MODE: mode}},
+                coordinator.api.websocket.async_control_device,
+            )
+            for did, mode in targets.items()
+        ),
+        return_exceptions=True,
+    )
+    probe: dict[str, Any] = {}
+    for did, result in zip(targets, results, strict=True):
+        if isinstance(result, Exception):
+            echoes.pop(did).cancel()
+            probe[did] = {"error": str(result)}
+
+    if echoes:
+        await asyncio.wait(echoes.values(), timeout=PROBE_TIMEOUT)
+    for did, echo in echoes.items():
+        if echo.done():
+            probe[did] = {"echo": echo.result() - start}
+        else:
+            echo.cancel()
+            probe[did] = {"echo": None}
+    return probe
 
 
 async def async_get_config_entry_diagnostics(
@@ -43,30 +73,8 @@ async def async_get_config_entry_diagnostics(
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     coordinator = entry.runtime_data
+    devices = coordinator.data or {}
     bindings = await coordinator.api.async_bindings()
-    devices = await coordinator.api.websocket.async_get_devices()
-    api_errors = []
-    api_callback = []
-
-    def callback(data):
-        api_callback.append(data)
-
-    coordinator.api.websocket.register_callback(callback)
-    try:
-        for did, device in devices.items():
-            old_state = device.get("attrs").get("mode")
-            if old_state:
-                await coordinator.api.websocket.async_control_device(
-                    did, {CONF_ATTRS: {CONF_MODE: "eco"}}
-                )
-                await coordinator.api.websocket.async_control_device(
-                    did, {CONF_ATTRS: {CONF_MODE: old_state}}
-                )
-    except Exception as err:  # noqa: BLE001
-        api_errors.append(err)
-    finally:
-        await asyncio.sleep(CALLBACK_WAIT)
-        coordinator.api.websocket.unregister_callback(callback)
 
     return {
         "entry": {
@@ -75,6 +83,18 @@ async def async_get_config_entry_diagnostics(
         },
         "bindings": async_redact_data(bindings, TO_REDACT),
         "devices": async_redact_data(devices, TO_REDACT),
-        "errors": api_errors,
-        "callbacks": api_callback,
+        **coordinator.frame_buffer.as_dict(),
+        # Result of the last probe service call
+        "probe": coordinator.probe,
+        "counters": {
+            **coordinator.counters.as_dict(),
+            "reconnects": coordinator.reconnects,
+        },
+        "latency": {
+            "account": coordinator.latency.as_dict(),
+            "products": {
+                product_key: histogram.as_dict()
+                for product_key, histogram in coordinator.product_latency.items()
+            },
+        },
     }
@@ -1,24 +1,71 @@
 """Parent Entity."""
 
 import logging
+from collections import defaultdict
+from collections.abc import Iterable
 from typing import Any
 
-from heatzypy import HeatzyException
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_ALIAS, CONF_ATTRS, CONF_MODEL, CONF_VERSION, DOMAIN
+from .const import (
+    ALL,
+    CONF_ALIAS,
+    CONF_ATTRS,
+    CONF_MODEL,
+    CONF_PRODUCT_KEY,
+    CONF_VERSION,
+    DOMAIN,
+)
 from .coordinator import HeatzyDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
+_UNSUPPORTED_PRODUCTS: set[str] = set()
+
+
+def index_descriptions[DescriptionT: EntityDescription](
+    descriptions: Iterable[DescriptionT],
+) -> dict[str, tuple[DescriptionT, ...]]:
+    """Index the descriptions of a platform by product key."""
+    index: defaultdict[str, list[DescriptionT]] = defaultdict(list)
+    for description in descriptions:
+        for product_key in description.products:  # type: ignore[attr-defined]
+            index[product_key].append(description)
+    return {product_key: tuple(items) for product_key, items in index.items()}
+
+
+@callback
+def async_get_descriptions[DescriptionT: EntityDescription](
+    index: dict[str, tuple[DescriptionT, ...]], device: dict[str, Any]
+) -> tuple[DescriptionT, ...]:
+    """Return the descriptions of a device, report unsupported products once."""
+    product_key = device.get(CONF_PRODUCT_KEY)
+    if product_key not in ALL and product_key not in _UNSUPPORTED_PRODUCTS:
+        _UNSUPPORTED_PRODUCTS.add(product_key)
+        _LOGGER.warning(
+            "Product %s (%s) is not supported", device.get(CONF_MODEL), product_key
+        )
+    return index.get(product_key, ())
+
+
+def hub_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device of the account, for the entities of no single device."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        manufacturer=DOMAIN.capitalize(),
+        name=entry.title,
+        entry_type=DeviceEntryType.SERVICE,
+    )
 
 
 class HeatzyEntity(CoordinatorEntity[HeatzyDataUpdateCoordinator]):
     """Base class for all entities."""
 
     _attr_has_entity_name = True
+    _state_fingerprint: int | None = None
     entity_description: EntityDescription
 
     def __init__(
@@ -39,23 +86,71 @@ class HeatzyEntity(CoordinatorEntity[HeatzyDataUpdateCoordinator]):
             model=coordinator.data[did].get(CONF_MODEL),
             name=coordinator.data[did][CONF_ALIAS],
         )
-        self._device = coordinator.data.get(did, {})
-        self._attrs = self._device.get(CONF_ATTRS, {})
+        self._update_device()
         self.async_control_device = coordinator.api.websocket.async_control_device
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state comes from the last known snapshot."""
+        return self.coordinator.is_stale(self.device_id)
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(
+                self.device_id, self._handle_coordinator_update
+            )
+        )
+
     async def _handle_action(
         self, config: dict[str, Any], error_msg: str = "Error unknown"
     ):
         """Execute action."""
-        try:
-            _LOGGER.debug("Handle action (%s): %s", self.device_id, config)
-            await self.async_control_device(self.device_id, config)
-        except HeatzyException as error:
-            _LOGGER.error("%s (%s)", error_msg, error)
+        _LOGGER.debug("Handle action (%s): %s", self.device_id, config)
+        if attrs := config.get(CONF_ATTRS):
+            self.coordinator.async_set_optimistic(self.device_id, attrs)
+        await self.coordinator.commands.async_send(
+            self.device_id, config, self.async_control_device, error_msg
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, counted by the coordinator."""
+        self.coordinator.counters.state_writes += 1
+        # Written outside of an update (optimistic state), compare again next time
+        self._state_fingerprint = None
+        super().async_write_ha_state()
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._device = self.coordinator.data.get(self.device_id, {})
-        self._attrs = self._device.get(CONF_ATTRS, {})
+        """Handle updated data, skip the write if the state did not change."""
+        self._update_device()
+        fingerprint = self._async_state_fingerprint()
+        if fingerprint == self._state_fingerprint:
+            self.coordinator.counters.skipped_writes += 1
+            return
         super()._handle_coordinator_update()
+        self._state_fingerprint = fingerprint
+
+    @callback
+    def _async_state_fingerprint(self) -> int:
+        """Return a fingerprint of the state and the attributes shown in hass."""
+        if not self.available:
+            return hash(False)
+        state = (
+            self.state,
+            self.assumed_state,
+            tuple((self.state_attributes or {}).items()),
+            tuple((self.extra_state_attributes or {}).items()),
+        )
+        try:
+            return hash(state)
+        except TypeError:
+            # Lists in the attributes
+            return hash(repr(state))
+
+    @callback
+    def _update_device(self) -> None:
+        """Read the decoded state of the device from the coordinator."""
+        self._device_state = self.coordinator.async_get_state(self.device_id)
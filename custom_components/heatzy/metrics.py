@@ -0,0 +1,168 @@
+"""Runtime metrics of the Heatzy integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from datetime import UTC, datetime
+from typing import Any
+
+LATENCY_SAMPLES = 500
+# Seconds of frames counted in the frame rate
+FRAME_WINDOW = 60
+# Frames and commands kept for the diagnostics
+FRAME_BUFFER_SIZE = 200
+
+
+class LatencyHistogram:
+    """Keep the recent round-trip latencies of the commands."""
+
+    def __init__(self, size: int = LATENCY_SAMPLES) -> None:
+        """Initialize."""
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.timeouts = 0
+
+    def add(self, latency: float) -> None:
+        """Record the latency (in seconds) of a confirmed command."""
+        self._samples.append(latency)
+        self.count += 1
+
+    def add_timeout(self) -> None:
+        """Record a command never confirmed by the device."""
+        self.timeouts += 1
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the percentile of the recent latencies, in seconds."""
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary of the histogram."""
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class RuntimeCounters:
+    """Count the activity of an account, cheap enough for every frame."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.frames = 0
+        self.devices_changed = 0
+        self.state_writes = 0
+        self.skipped_writes = 0
+        self.polls = 0
+        self.duplicates = 0
+        self.command_successes = 0
+        self.command_failures = 0
+        self.last_frame: float | None = None
+        self.last_frame_time: datetime | None = None
+        self._recent_frames: deque[float] = deque()
+
+    def add_frame(self, changed: int) -> None:
+        """Record a frame and the number of devices it changed."""
+        self.last_frame = now = time.monotonic()
+        self.last_frame_time = datetime.now(UTC)
+        self.frames += 1
+        self.devices_changed += changed
+        self._recent_frames.append(now)
+        self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        """Forget the frames older than the window."""
+        while self._recent_frames and self._recent_frames[0] <= now - FRAME_WINDOW:
+            self._recent_frames.popleft()
+
+    @property
+    def frames_per_minute(self) -> int:
+        """Return the number of frames received during the last minute."""
+        self._trim(time.monotonic())
+        return len(self._recent_frames)
+
+    @property
+    def changed_per_frame(self) -> float | None:
+        """Return the average number of devices changed by a frame."""
+        if not self.frames:
+            return None
+        return self.devices_changed / self.frames
+
+    @property
+    def last_frame_age(self) -> float | None:
+        """Return the seconds since the last frame."""
+        if self.last_frame is None:
+            return None
+        return time.monotonic() - self.last_frame
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters."""
+        return {
+            "frames": self.frames,
+            "frames_per_minute": self.frames_per_minute,
+            "changed_per_frame": self.changed_per_frame,
+            "last_frame_age": self.last_frame_age,
+            "state_writes": self.state_writes,
+            "skipped_writes": self.skipped_writes,
+            "polls": self.polls,
+            "duplicates": self.duplicates,
+            "command_successes": self.command_successes,
+            "command_failures": self.command_failures,
+        }
+
+
+class FrameBuffer:
+    """Keep the recent frames and commands, with the echoes of the commands."""
+
+    def __init__(self, size: int = FRAME_BUFFER_SIZE) -> None:
+        """Initialize."""
+        self.frames: deque[dict[str, Any]] = deque(maxlen=size)
+        self.commands: deque[dict[str, Any]] = deque(maxlen=size)
+        self._unconfirmed: dict[str, dict[str, Any]] = {}
+        self._waiters: dict[str, list[asyncio.Future[float]]] = {}
+
+    @property
+    def dids(self) -> set[str]:
+        """Return the devices with a frame in the buffer."""
+        return {frame["did"] for frame in self.frames}
+
+    def add_frame(self, did: str, attrs: dict[str, Any]) -> None:
+        """Record a frame which changed a device and wake up its waiters."""
+        self.frames.append({"time": time.time(), "did": did, "attrs": dict(attrs)})
+        self.async_wake(did)
+
+    def async_wake(self, did: str) -> None:
+        """Wake up the waiters of a device which sent a frame."""
+        now = time.monotonic()
+        for waiter in self._waiters.pop(did, ()):
+            if not waiter.done():
+                waiter.set_result(now)
+
+    def add_command(self, did: str, attrs: dict[str, Any]) -> None:
+        """Record a command waiting for its echo."""
+        command = {"time": time.time(), "did": did, "attrs": dict(attrs)}
+        self._unconfirmed[did] = command
+        self.commands.append(command)
+
+    def add_echo(self, did: str, latency: float | None) -> None:
+        """Pair the last command of a device with its echo, None if it timed out."""
+        if (command := self._unconfirmed.pop(did, None)) is not None:
+            command["echo"] = latency
+
+    def async_wait_frame(self, did: str) -> asyncio.Future[float]:
+        """Return a future set to the monotonic time of the next frame."""
+        waiter: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(did, []).append(waiter)
+        return waiter
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the frames and the commands."""
+        return {"frames": list(self.frames), "commands": list(self.commands)}
@@ -0,0 +1,161 @@
+"""Device states of the Heatzy products."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    BLOOM,
+    CFT_TEMP_H,
+    CFT_TEMP_L,
+    CONF_ATTRS,
+    CONF_CFT_TEMP,
+    CONF_CUR_MODE,
+    CONF_CUR_SIGNAL,
+    CONF_CUR_TEMP,
+    CONF_DEROG_MODE,
+    CONF_DEROG_TIME,
+    CONF_ECO_TEMP,
+    CONF_HEATING_STATE,
+    CONF_HUMIDITY,
+    CONF_IS_ONLINE,
+    CONF_LOCK,
+    CONF_LOCK_OTHER,
+    CONF_MODE,
+    CONF_ON_OFF,
+    CONF_PRODUCT_KEY,
+    CONF_TIMER_SWITCH,
+    CONF_WINDOW,
+    CUR_TEMP_L,
+    ECO_TEMP_H,
+    ECO_TEMP_L,
+    GLOW,
+    PILOTE_PRO_V1,
+    PILOTE_V1,
+)
+
+
+class HeatzyDeviceState:
+    """State of a Pilote v2, v3 or v4, decoded from its attributes."""
+
+    __slots__ = (
+        "comfort_temperature",
+        "current_humidity",
+        "current_temperature",
+        "derog_mode",
+        "derog_time",
+        "eco_temperature",
+        "heating",
+        "is_online",
+        "lock",
+        "mode",
+        "signal",
+        "stopped",
+        "timer",
+        "window",
+    )
+
+    value_stop: Any = "stop"
+
+    def __init__(self, device: dict[str, Any]) -> None:
+        """Decode the device."""
+        attrs = device.get(CONF_ATTRS) or {}
+        self.is_online: bool = device.get(CONF_IS_ONLINE, True)
+        self.derog_mode: int = attrs.get(CONF_DEROG_MODE) or 0
+        self.derog_time: int = attrs.get(CONF_DEROG_TIME) or 0
+        self.timer: bool = attrs.get(CONF_TIMER_SWITCH) == 1
+        self.lock: bool = attrs.get(CONF_LOCK) == 1
+        self.mode: Any = attrs.get(CONF_MODE)
+        self.stopped: bool = self.mode == self.value_stop
+        self.heating: bool = False
+        self.window: bool = False
+        self.signal: str | None = None
+        self.current_humidity: float | None = None
+        self.current_temperature: float | None = None
+        self.comfort_temperature: float | None = None
+        self.eco_temperature: float | None = None
+        self._decode(attrs)
+
+    def _decode(self, attrs: dict[str, Any]) -> None:
+        """Decode the attributes of the product family."""
+
+    def __repr__(self) -> str:
+        """Return the decoded state."""
+        values = ", ".join(
+            f"{slot}={getattr(self, slot)!r}" for slot in HeatzyDeviceState.__slots__
+        )
+        return f"{type(self).__name__}({values})"
+
+
+class PiloteV1State(HeatzyDeviceState):
+    """State of a Pilote v1."""
+
+    __slots__ = ()
+
+    value_stop = "\u505c\u6b62"
+
+
+class GlowState(HeatzyDeviceState):
+    """State of a Glow, Onyx or Inea."""
+
+    __slots__ = ()
+
+    def _decode(self, attrs: dict[str, Any]) -> None:
+        """Temperatures are in tenths of degree, on two bytes."""
+        self.stopped = attrs.get(CONF_ON_OFF) == 0
+        self.lock = attrs.get(CONF_LOCK_OTHER) == 1
+        self.current_temperature = attrs.get(CUR_TEMP_L, 0) / 10
+        self.comfort_temperature = (
+            attrs.get(CFT_TEMP_L, 0) + attrs.get(CFT_TEMP_H, 0) * 256
+        ) / 10
+        self.eco_temperature = (
+            attrs.get(ECO_TEMP_L, 0) + attrs.get(ECO_TEMP_H, 0) * 256
+        ) / 10
+
+
+class BloomState(HeatzyDeviceState):
+    """State of a Bloom."""
+
+    __slots__ = ()
+
+    def _decode(self, attrs: dict[str, Any]) -> None:
+        """Temperatures are in degrees."""
+        self.current_temperature = attrs.get(CONF_CUR_TEMP)
+        self.comfort_temperature = attrs.get(CONF_CFT_TEMP)
+        self.eco_temperature = attrs.get(CONF_ECO_TEMP)
+
+
+class PiloteProState(HeatzyDeviceState):
+    """State of a Pilote Pro."""
+
+    __slots__ = ()
+
+    def _decode(self, attrs: dict[str, Any]) -> None:
+        """The current mode follows the presence, temperatures in tenths."""
+        self.mode = attrs.get(CONF_CUR_MODE)
+        self.stopped = self.mode == self.value_stop
+        self.heating = attrs.get(CONF_HEATING_STATE) == 1
+        self.window = attrs.get(CONF_WINDOW) == 1
+        self.signal = attrs.get(CONF_CUR_SIGNAL)
+        self.current_humidity = attrs.get(CONF_HUMIDITY)
+        self.current_temperature = attrs.get(CONF_CUR_TEMP, 0) / 10
+        self.comfort_temperature = attrs.get(CONF_CFT_TEMP, 0) / 10
+        self.eco_temperature = attrs.get(CONF_ECO_TEMP, 0) / 10
+
+
+STATE_TYPES: dict[str, type[HeatzyDeviceState]] = {
+    product_key: cls
+    for products, cls in (
+        (PILOTE_V1, PiloteV1State),
+        (GLOW, GlowState),
+        (BLOOM, BloomState),
+        (PILOTE_PRO_V1, PiloteProState),
+    )
+    for product_key in products
+}
+
+
+def decode_device(device: dict[str, Any]) -> HeatzyDeviceState:
+    """Return the state of a device, according to its product."""
+    cls = STATE_TYPES.get(device.get(CONF_PRODUCT_KEY), HeatzyDeviceState)
+    return cls(device)
@@ -4,7 +4,6 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any, Final
 
-from homeassistant.components.climate import PRESET_BOOST
 from homeassistant.components.number import (
     NumberDeviceClass,
     NumberEntityDescription,
@@ -14,9 +13,9 @@ from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HeatzyConfigEntry, HeatzyDataUpdateCoordinator
-from .const import ALL, CONF_PRODUCT_KEY, PRESET_VACATION
-from .entity import HeatzyEntity
+from . import HeatzyConfigEntry
+from .const import ALL, ATTR_BOOST, ATTR_VACATION
+from .entity import HeatzyEntity, async_get_descriptions, index_descriptions
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -24,7 +23,7 @@ class HeatzyNumberEntityDescription(NumberEntityDescription):
     """Represents an Flow Sensor."""
 
     attr: str
-    products: list[str]
+    products: frozenset[str]
     cls: Callable[..., Any] = lambda *args: HeatzyNumber(*args)
 
 
@@ -40,7 +39,7 @@ NUMBER_TYPES: Final[tuple[HeatzyNumberEntityDescription, ...]] = (
         native_unit_of_measurement=UnitOfTime.DAYS,
         native_min_value=1,
         native_max_value=255,
-        attr = PRESET_VACATION
+        attr=ATTR_VACATION,
     ),
     HeatzyNumberEntityDescription(
         key="boost",
@@ -53,10 +52,12 @@ NUMBER_TYPES: Final[tuple[HeatzyNumberEntityDescription, ...]] = (
         native_unit_of_measurement=UnitOfTime.MINUTES,
         native_min_value=1,
         native_max_value=255,
-        attr= PRESET_BOOST
+        attr=ATTR_BOOST,
     ),
 )
 
+NUMBER_INDEX = index_descriptions(NUMBER_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -65,45 +66,46 @@ async def async_setup_entry(
 ) -> None:
     """Set up the platform."""
     coordinator = entry.runtime_data
-    entities = []
-    for unique_id, device in coordinator.data.items():
-        product_key = device.get(CONF_PRODUCT_KEY)
-        for description in NUMBER_TYPES:
-            cls = description.cls
-            if product_key in description.products:
-                entities.extend([cls(coordinator, description, unique_id)])
+    entities = [
+        description.cls(coordinator, description, unique_id)
+        for unique_id, device in coordinator.data.items()
+        for description in async_get_descriptions(NUMBER_INDEX, device)
+    ]
     async_add_entities(entities)
 
 
 class HeatzyNumber(HeatzyEntity, RestoreNumber):
     """Number entity."""
 
-    def __init__(
-        self,
-        coordinator: HeatzyDataUpdateCoordinator,
-        description: HeatzyNumberEntityDescription,
-        did: str,
-    ) -> None:
-        """Initialize."""
-        super().__init__(coordinator, description, did)
-        self._resolve_state = 1
+    entity_description: HeatzyNumberEntityDescription
 
     @property
     def native_value(self) -> float | None:
-        """Return the value reported by the sensor."""
-        return self._resolve_state
+        """Return the value of the setting."""
+        return self.coordinator.settings.async_get(
+            self.device_id, self.entity_description.attr
+        )
 
     async def async_added_to_hass(self) -> None:
-        """Restore last state."""
+        """Restore last state if the setting was never saved."""
+        await super().async_added_to_hass()
+        if self.native_value is not None:
+            return
+
+        value: float | None = 1
         if (
             last_state := await self.async_get_last_state()
         ) and last_state.state not in {STATE_UNKNOWN, STATE_UNAVAILABLE}:
             last_number_data = await self.async_get_last_number_data()
             if last_number_data:
-                self._resolve_state = last_number_data.native_value
+                value = last_number_data.native_value
+        self.coordinator.settings.async_set(
+            self.device_id, self.entity_description.attr, value
+        )
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
-        self._device[self.entity_description.attr] = value
-        self._resolve_state = value
+        self.coordinator.settings.async_set(
+            self.device_id, self.entity_description.attr, value
+        )
         self.async_write_ha_state()
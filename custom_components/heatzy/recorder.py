@@ -0,0 +1,103 @@
+"""Capture of the websocket frames, and their replay."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import TO_REDACT
+
+if TYPE_CHECKING:
+    from .coordinator import HeatzyDataUpdateCoordinator
+
+# Seconds between two writes of the capture
+CAPTURE_FLUSH = 5
+
+
+class FrameRecorder:
+    """Append the raw frames to a compressed and redacted capture.
+
+    Each line holds the monotonic time of a frame and its payload. The frames
+    are written in batches, by the executor.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.path = path
+        self.frames = 0
+        self._lines: list[str] = []
+        self._lock = asyncio.Lock()
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_record(self, data: dict[str, Any]) -> None:
+        """Record a frame, as received."""
+        frame = async_redact_data(data, TO_REDACT)
+        self._lines.append(json.dumps({"t": time.monotonic(), "frame": frame}))
+        self.frames += 1
+        if self._unsub is None:
+            self._unsub = async_call_later(
+                self.hass,
+                CAPTURE_FLUSH,
+                HassJob(
+                    self._async_flush, "heatzy-capture-flush", cancel_on_shutdown=True
+                ),
+            )
+
+    async def _async_flush(self, _: Any = None) -> None:
+        """Append the recorded frames to the capture."""
+        self._unsub = None
+        lines, self._lines = self._lines, []
+        if lines:
+            async with self._lock:
+                await self.hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines, in a new gzip member."""
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    async def async_stop(self) -> None:
+        """Write the last frames."""
+        if self._unsub:
+            self._unsub()
+        await self._async_flush()
+
+
+def read_capture(path: str) -> list[tuple[float, dict[str, Any]]]:
+    """Return the time and the payload of the frames of a capture."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+    return [(entry["t"], entry["frame"]) for entry in entries]
+
+
+async def async_replay(
+    coordinator: HeatzyDataUpdateCoordinator, path: str, speed: float | None = 1
+) -> int:
+    """Feed a capture to the coordinator, return the number of frames.
+
+    The delays between the frames are divided by the speed, the frames are
+    replayed as fast as possible if the speed is None.
+    """
+    frames = await coordinator.hass.async_add_executor_job(read_capture, path)
+    if not frames:
+        return 0
+
+    first = frames[0][0]
+    start = time.monotonic()
+    for timestamp, frame in frames:
+        delay = 0.0
+        if speed:
+            delay = (timestamp - first) / speed - (time.monotonic() - start)
+        # Let the event loop run between the frames, as with the websocket
+        await asyncio.sleep(max(delay, 0))
+        coordinator._async_handle_websocket_data(frame)
+    return len(frames)
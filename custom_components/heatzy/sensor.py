@@ -0,0 +1,284 @@
+"""Sensor for Heatzy."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Final
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import HeatzyConfigEntry, HeatzyDataUpdateCoordinator
+from .const import CONF_MODEL, CONF_PRODUCT_KEY
+from .entity import hub_device_info
+from .metrics import LatencyHistogram
+
+
+def _histogram(
+    coordinator: HeatzyDataUpdateCoordinator, product_key: str | None
+) -> LatencyHistogram | None:
+    """Return the latencies of the account, or of a product."""
+    if product_key is None:
+        return coordinator.latency
+    return coordinator.product_latency.get(product_key)
+
+
+def _latency(
+    percent: float, product_key: str | None = None
+) -> Callable[[HeatzyDataUpdateCoordinator], Any]:
+    """Return the latency percentile in milliseconds."""
+
+    def value_fn(coordinator: HeatzyDataUpdateCoordinator) -> int | None:
+        if (histogram := _histogram(coordinator, product_key)) is None or (
+            latency := histogram.percentile(percent)
+        ) is None:
+            return None
+        return round(latency * 1000)
+
+    return value_fn
+
+
+def _timeouts(
+    product_key: str | None = None,
+) -> Callable[[HeatzyDataUpdateCoordinator], int]:
+    """Return the number of commands never confirmed."""
+
+    def value_fn(coordinator: HeatzyDataUpdateCoordinator) -> int:
+        histogram = _histogram(coordinator, product_key)
+        return histogram.timeouts if histogram else 0
+
+    return value_fn
+
+
+@dataclass(frozen=True, kw_only=True)
+class HeatzySensorEntityDescription(SensorEntityDescription):
+    """Represents an account sensor."""
+
+    # Diagnostics for the troubleshooting, not for every installation
+    entity_registry_enabled_default: bool = False
+    value_fn: Callable[[HeatzyDataUpdateCoordinator], Any]
+
+
+SENSOR_TYPES: Final[tuple[HeatzySensorEntityDescription, ...]] = (
+    HeatzySensorEntityDescription(
+        key="latency_p50",
+        name="Command latency p50",
+        translation_key="latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_latency(50),
+    ),
+    HeatzySensorEntityDescription(
+        key="latency_p95",
+        name="Command latency p95",
+        translation_key="latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_latency(95),
+    ),
+    HeatzySensorEntityDescription(
+        key="latency_p99",
+        name="Command latency p99",
+        translation_key="latency_p99",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_latency(99),
+    ),
+    HeatzySensorEntityDescription(
+        key="command_timeouts",
+        name="Command timeouts",
+        translation_key="command_timeouts",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_timeouts(),
+    ),
+    HeatzySensorEntityDescription(
+        key="frames_per_minute",
+        name="Websocket frames per minute",
+        translation_key="frames_per_minute",
+        icon="mdi:swap-vertical",
+        native_unit_of_measurement="frames/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.frames_per_minute,
+    ),
+    HeatzySensorEntityDescription(
+        key="changed_per_frame",
+        name="Devices changed per frame",
+        translation_key="changed_per_frame",
+        icon="mdi:swap-vertical",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.changed_per_frame,
+    ),
+    HeatzySensorEntityDescription(
+        key="duplicates",
+        name="Duplicate frames dropped",
+        translation_key="duplicates",
+        icon="mdi:content-duplicate",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.duplicates,
+    ),
+    HeatzySensorEntityDescription(
+        key="last_frame",
+        name="Last frame",
+        translation_key="last_frame",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.last_frame_time,
+    ),
+    HeatzySensorEntityDescription(
+        key="state_writes",
+        name="State writes",
+        translation_key="state_writes",
+        icon="mdi:database-edit-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.state_writes,
+    ),
+    HeatzySensorEntityDescription(
+        key="skipped_writes",
+        name="State writes skipped",
+        translation_key="skipped_writes",
+        icon="mdi:database-off-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.skipped_writes,
+    ),
+    HeatzySensorEntityDescription(
+        key="polls",
+        name="HTTP polls",
+        translation_key="polls",
+        icon="mdi:cloud-download-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.polls,
+    ),
+    HeatzySensorEntityDescription(
+        key="reconnects",
+        name="Websocket reconnects",
+        translation_key="reconnects",
+        icon="mdi:connection",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.reconnects,
+    ),
+    HeatzySensorEntityDescription(
+        key="command_successes",
+        name="Command successes",
+        translation_key="command_successes",
+        icon="mdi:send-check-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.command_successes,
+    ),
+    HeatzySensorEntityDescription(
+        key="command_failures",
+        name="Command failures",
+        translation_key="command_failures",
+        icon="mdi:send-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.counters.command_failures,
+    ),
+)
+
+
+def product_descriptions(
+    product_key: str, model: str
+) -> tuple[HeatzySensorEntityDescription, ...]:
+    """Return the latency sensors of a product of the account."""
+    return (
+        *(
+            HeatzySensorEntityDescription(
+                key=f"latency_p{percent}_{product_key}",
+                name=f"{model} command latency p{percent}",
+                device_class=SensorDeviceClass.DURATION,
+                native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                value_fn=_latency(percent, product_key),
+            )
+            for percent in (50, 95, 99)
+        ),
+        HeatzySensorEntityDescription(
+            key=f"command_timeouts_{product_key}",
+            name=f"{model} command timeouts",
+            icon="mdi:timer-alert-outline",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=_timeouts(product_key),
+        ),
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: HeatzyConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the sensors."""
+    coordinator = entry.runtime_data
+    products = {
+        device[CONF_PRODUCT_KEY]: device.get(CONF_MODEL) or device[CONF_PRODUCT_KEY]
+        for device in coordinator.data.values()
+        if device.get(CONF_PRODUCT_KEY)
+    }
+    descriptions = [*SENSOR_TYPES]
+    for product_key, model in products.items():
+        descriptions.extend(product_descriptions(product_key, model))
+    async_add_entities(
+        HeatzyHubSensor(coordinator, description) for description in descriptions
+    )
+
+
+class HeatzyHubSensor(SensorEntity):
+    """Sensor of the Heatzy account, written when the coordinator changes it."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    entity_description: HeatzySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: HeatzyDataUpdateCoordinator,
+        description: HeatzySensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        entry = coordinator.entry
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = hub_device_info(entry)
+        self._attr_native_value = description.value_fn(coordinator)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the metrics of the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_metrics_listener(self._handle_metrics_update)
+        )
+
+    @callback
+    def _handle_metrics_update(self) -> None:
+        """Write the state if the value changed."""
+        value = self.entity_description.value_fn(self.coordinator)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
@@ -0,0 +1,146 @@
+"""Services of the Heatzy integration."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import voluptuous as vol
+from heatzypy import HeatzyException
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID, ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import CONF_ATTRS, CONF_PRODUCT_KEY, DOMAIN, PILOTE_V1
+from .coordinator import HeatzyDataUpdateCoordinator
+from .diagnostics import async_probe
+
+SERVICE_BULK_CONTROL = "bulk_control"
+SERVICE_PROBE = "probe"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+
+BULK_CONTROL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(CONF_ATTRS): vol.All(dict, vol.Length(min=1)),
+    }
+)
+
+CAPTURE_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+
+def _async_get_coordinator(
+    hass: HomeAssistant, entry_id: str
+) -> HeatzyDataUpdateCoordinator:
+    """Return the coordinator of a loaded entry."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ServiceValidationError(f"{entry_id} is not a loaded Heatzy entry")
+    return entry.runtime_data
+
+
+def _async_get_device(
+    hass: HomeAssistant, device_id: str
+) -> tuple[HeatzyDataUpdateCoordinator, str]:
+    """Return the coordinator and the Heatzy id of a device."""
+    if device := dr.async_get(hass).async_get(device_id):
+        for entry_id in device.config_entries:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if (
+                entry is None
+                or entry.domain != DOMAIN
+                or entry.state is not ConfigEntryState.LOADED
+            ):
+                continue
+            coordinator: HeatzyDataUpdateCoordinator = entry.runtime_data
+            for domain, did in device.identifiers:
+                if domain == DOMAIN and did in coordinator.data:
+                    return coordinator, did
+
+    raise ServiceValidationError(f"{device_id} is not a loaded Heatzy device")
+
+
+async def _async_control(
+    coordinator: HeatzyDataUpdateCoordinator, did: str, attrs: dict[str, Any]
+) -> dict[str, Any]:
+    """Send the attributes to a device and return the result."""
+    if coordinator.data[did].get(CONF_PRODUCT_KEY) in PILOTE_V1:
+        # Pilote v1 only accepts raw frames, sent over HTTP
+        return {"did": did, "success": False, "error": "Pilote v1 not supported"}
+    coordinator.async_set_optimistic(did, attrs)
+    try:
+        await coordinator.commands.async_send_now(
+            did, {CONF_ATTRS: attrs}, coordinator.api.websocket.async_control_device
+        )
+    except HeatzyException as error:
+        return {"did": did, "success": False, "error": str(error)}
+    return {"did": did, "success": True}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_bulk_control(call: ServiceCall) -> ServiceResponse:
+        """Send the same attributes to many devices at once."""
+        attrs = call.data[CONF_ATTRS]
+        device_ids = list(dict.fromkeys(call.data[ATTR_DEVICE_ID]))
+        targets = [_async_get_device(hass, device_id) for device_id in device_ids]
+
+        # The command queues bound the concurrency and the rate of the frames
+        results = await asyncio.gather(
+            *(_async_control(coordinator, did, attrs) for coordinator, did in targets)
+        )
+        return {"devices": dict(zip(device_ids, results, strict=True))}
+
+    async def async_start_capture(call: ServiceCall) -> ServiceResponse:
+        """Record the websocket frames of an account."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        coordinator = _async_get_coordinator(hass, entry_id)
+        path = hass.config.path(f"{DOMAIN}_{entry_id}_capture.jsonl.gz")
+        await coordinator.async_start_capture(path)
+        return {"path": path}
+
+    async def async_stop_capture(call: ServiceCall) -> ServiceResponse:
+        """Stop recording the websocket frames of an account."""
+        coordinator = _async_get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        return {"frames": await coordinator.async_stop_capture() or 0}
+
+    async def async_probe_devices(call: ServiceCall) -> ServiceResponse:
+        """Probe the silent devices of an account, for the diagnostics."""
+        coordinator = _async_get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        coordinator.probe = await async_probe(coordinator)
+        return coordinator.probe
+
+    for service, handler in (
+        (SERVICE_START_CAPTURE, async_start_capture),
+        (SERVICE_STOP_CAPTURE, async_stop_capture),
+        (SERVICE_PROBE, async_probe_devices),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            handler,
+            schema=CAPTURE_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_CONTROL,
+        async_bulk_control,
+        schema=BULK_CONTROL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,47 @@
+"""Settings of the Heatzy devices."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+SAVE_DELAY = 10
+STORAGE_VERSION = 1
+
+
+@callback
+def async_get_settings_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store of the device settings."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.settings")
+
+
+class HeatzySettings:
+    """Settings of the devices, shared by their entities and saved to disk."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize."""
+        self._store = async_get_settings_store(hass, entry)
+        self._settings: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved settings."""
+        self._settings = await self._store.async_load() or {}
+
+    @callback
+    def async_get(self, did: str, key: str, default: Any = None) -> Any:
+        """Return a setting of a device."""
+        return self._settings.get(did, {}).get(key, default)
+
+    @callback
+    def async_set(self, did: str, key: str, value: Any) -> None:
+        """Change a setting of a device, the writes are batched."""
+        settings = self._settings.setdefault(did, {})
+        if settings.get(key) == value:
+            return
+        settings[key] = value
+        self._store.async_delay_save(lambda: self._settings, SAVE_DELAY)
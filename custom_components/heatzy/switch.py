@@ -1,6 +1,5 @@
 """Switch for Heatzy."""
 
-
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any, Final
@@ -17,7 +16,6 @@ from .const import (
     CONF_DEROG_MODE,
     CONF_LOCK,
     CONF_LOCK_OTHER,
-    CONF_PRODUCT_KEY,
     CONF_WINDOW,
     GLOW,
     PILOTE_PRO_V1,
@@ -25,7 +23,7 @@ from .const import (
     PILOTE_V3,
     PILOTE_V4,
 )
-from .entity import HeatzyEntity
+from .entity import HeatzyEntity, async_get_descriptions, index_descriptions
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -33,7 +31,7 @@ class HeatzySwitchEntityDescription(SwitchEntityDescription):
     """Represents an Flow Sensor."""
 
     attr: str
-    products: list[str]
+    products: frozenset[str]
     value_fn: Callable[..., Any]
     cls: Callable[..., Any] = lambda *args: HeatzySwitch(*args)
 
@@ -43,10 +41,10 @@ SWITCH_TYPES: Final[tuple[HeatzySwitchEntityDescription, ...]] = (
         key="lock",
         name="Lock",
         translation_key="lock",
-        products=PILOTE_V2 + PILOTE_V3 + PILOTE_V4 + BLOOM + PILOTE_PRO_V1,
+        products=PILOTE_V2 | PILOTE_V3 | PILOTE_V4 | BLOOM | PILOTE_PRO_V1,
         attr=CONF_LOCK,
         entity_category=EntityCategory.CONFIG,
-        value_fn=lambda attrs: attrs.get(CONF_LOCK) == 1,
+        value_fn=lambda state: state.lock,
     ),
     HeatzySwitchEntityDescription(
         key="lock",
@@ -55,7 +53,7 @@ SWITCH_TYPES: Final[tuple[HeatzySwitchEntityDescription, ...]] = (
         products=GLOW,
         attr=CONF_LOCK_OTHER,
         entity_category=EntityCategory.CONFIG,
-        value_fn=lambda attrs: attrs.get(CONF_LOCK_OTHER) == 1,
+        value_fn=lambda state: state.lock,
     ),
     HeatzySwitchEntityDescription(
         key="window",
@@ -65,7 +63,7 @@ SWITCH_TYPES: Final[tuple[HeatzySwitchEntityDescription, ...]] = (
         icon="mdi:window-open-variant",
         attr=CONF_WINDOW,
         entity_category=EntityCategory.CONFIG,
-        value_fn=lambda attrs: attrs.get(CONF_WINDOW) == 1,
+        value_fn=lambda state: state.window,
     ),
     HeatzySwitchEntityDescription(
         key="presence_enabled",
@@ -76,10 +74,12 @@ SWITCH_TYPES: Final[tuple[HeatzySwitchEntityDescription, ...]] = (
         attr=CONF_DEROG_MODE,
         entity_category=EntityCategory.CONFIG,
         cls=lambda *args: PresenceSwitch(*args),
-        value_fn=lambda attrs: attrs.get(CONF_DEROG_MODE) == 3,
+        value_fn=lambda state: state.derog_mode == 3,
     ),
 )
 
+SWITCH_INDEX = index_descriptions(SWITCH_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -88,14 +88,11 @@ async def async_setup_entry(
 ) -> None:
     """Set the sensor platform."""
     coordinator = entry.runtime_data
-    entities = []
-
-    for unique_id, device in coordinator.data.items():
-        product_key = device.get(CONF_PRODUCT_KEY)
-        for description in SWITCH_TYPES:
-            cls = description.cls
-            if product_key in description.products:
-                entities.extend([cls(coordinator, description, unique_id)])
+    entities = [
+        description.cls(coordinator, description, unique_id)
+        for unique_id, device in coordinator.data.items()
+        for description in async_get_descriptions(SWITCH_INDEX, device)
+    ]
 
     async_add_entities(entities)
 
@@ -108,7 +105,7 @@ class HeatzySwitch(HeatzyEntity, SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        return self.entity_description.value_fn(self._attrs)
+        return self.entity_description.value_fn(self._device_state)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
@@ -0,0 +1,165 @@
+"""Fixtures of the benchmarks.
+
+The benchmarks are skipped unless HEATZY_BENCHMARK is set. The results are
+logged, and stored in <HEATZY_BENCHMARK_DIR>/<version>.json when the directory
+is set, then compared with the latest results of another version. Set
+HEATZY_BENCHMARK_VERSION to compare commits of the same version.
+"""
+
+import copy
+import json
+import logging
+import os
+import statistics
+import time
+from collections.abc import Callable, Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_json_object_fixture
+
+from custom_components.heatzy.const import (
+    ALL,
+    BLOOM,
+    CONF_ALIAS,
+    CONF_PRODUCT_KEY,
+    GLOW,
+    PILOTE_PRO_V1,
+    PILOTE_V1,
+    PILOTE_V2,
+    PILOTE_V3,
+    PILOTE_V4,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ROOT = Path(__file__).parents[2]
+ENABLED = bool(os.environ.get("HEATZY_BENCHMARK"))
+RESULTS_DIR = (
+    Path(results_dir)
+    if (results_dir := os.environ.get("HEATZY_BENCHMARK_DIR"))
+    else None
+)
+VERSION = (
+    os.environ.get("HEATZY_BENCHMARK_VERSION")
+    or json.loads(
+        (ROOT / "custom_components" / "heatzy" / "manifest.json").read_text()
+    )["version"]
+)
+
+ACCOUNT_SIZES = [10, 100, 1000]
+FAMILIES = (PILOTE_V1, PILOTE_V2, PILOTE_V3, PILOTE_V4, GLOW, BLOOM, PILOTE_PRO_V1)
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip the benchmarks in the default test run."""
+    if ENABLED:
+        return
+    skip = pytest.mark.skip(reason="Set HEATZY_BENCHMARK to run the benchmarks")
+    benchmarks = Path(__file__).parent
+    for item in items:
+        if benchmarks in item.path.parents:
+            item.add_marker(skip)
+
+
+def synthetic_devices(count: int) -> dict[str, dict[str, Any]]:
+    """Return count devices, spread over all the product keys."""
+    fixture = load_json_object_fixture("Devices.json").values()
+    templates = {}
+    for family in FAMILIES:
+        template = next(d for d in fixture if d[CONF_PRODUCT_KEY] in family)
+        templates.update(dict.fromkeys(family, template))
+
+    product_keys = sorted(ALL)
+    devices = {}
+    for index in range(count):
+        product_key = product_keys[index % len(product_keys)]
+        did = f"bench{index:017d}"
+        device = copy.deepcopy(templates[product_key])
+        device.update(
+            {"did": did, CONF_ALIAS: f"Bench {index}", CONF_PRODUCT_KEY: product_key}
+        )
+        devices[did] = device
+    return devices
+
+
+class BenchmarkResults:
+    """Collect the timings of a session."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.results: dict[str, float] = {}
+
+    def measure(self, name: str, func: Callable[[], Any], rounds: int = 10) -> float:
+        """Return the median duration of func in seconds, and record it."""
+        durations = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+        return self.record(name, statistics.median(durations))
+
+    def record(self, name: str, duration: float) -> float:
+        """Record a duration in seconds."""
+        self.results[name] = duration
+        _LOGGER.info("%s: %.3f ms", name, duration * 1e3)
+        return duration
+
+    def speedup(self, name: str, reference: str) -> float:
+        """Log and return how many times name is faster than reference."""
+        ratio = self.results[reference] / self.results[name]
+        _LOGGER.info("%s: %.1fx faster than %s", name, ratio, reference)
+        return ratio
+
+    def save(self) -> None:
+        """Store the results, and compare them with the previous version."""
+        if not self.results or RESULTS_DIR is None:
+            return
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{VERSION}.json"
+        previous = sorted(
+            (other for other in RESULTS_DIR.glob("*.json") if other != path),
+            key=lambda other: other.stat().st_mtime,
+        )
+        stored = json.loads(path.read_text()) if path.exists() else {}
+        path.write_text(json.dumps({**stored, **self.results}, indent=2))
+
+        if not previous:
+            return
+        baseline = json.loads(previous[-1].read_text())
+        _LOGGER.info("Benchmarks %s against %s", VERSION, previous[-1].stem)
+        for name, duration in sorted(self.results.items()):
+            if before := baseline.get(name):
+                _LOGGER.info("%s: %+.1f%%", name, (duration - before) / before * 100)
+
+
+@pytest.fixture(scope="session", name="benchmark_results")
+def session_results() -> Generator[BenchmarkResults]:
+    """Return the results of the session, stored when it ends."""
+    results = BenchmarkResults()
+    yield results
+    results.save()
+
+
+@pytest.fixture(name="account")
+def mock_account(
+    HeatzyClient: AsyncMock,
+) -> Callable[[int], dict[str, dict[str, Any]]]:
+    """Return a factory of synthetic accounts served by the client."""
+
+    def _account(count: int) -> dict[str, dict[str, Any]]:
+        devices = synthetic_devices(count)
+        HeatzyClient.async_get_devices.return_value = devices
+
+        def _register_callback(*args, **kwargs):
+            if cb := kwargs.get("callback"):
+                cb(devices)
+
+        HeatzyClient.websocket.register_callback.side_effect = _register_callback
+        return devices
+
+    return _account
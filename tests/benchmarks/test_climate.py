@@ -0,0 +1,103 @@
+"""Benchmark the updates of the climate entities."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.components.climate import DOMAIN as CLIM_DOMAIN
+from homeassistant.components.climate import PRESET_COMFORT, PRESET_ECO
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.heatzy.climate import HeatzyThermostat
+from custom_components.heatzy.const import CONF_ATTRS, CONF_MODE
+from custom_components.heatzy.models import decode_device
+
+from .conftest import ACCOUNT_SIZES
+
+UPDATES = 1000
+
+
+def _use_property_path(entity: HeatzyThermostat) -> None:
+    """Decode the climate state on each property read, as before the cache."""
+    entity.__class__ = type(
+        f"PropertyPath{type(entity).__name__}",
+        (type(entity),),
+        {
+            "_climate_state": property(
+                lambda self: self._decode_state(), lambda self, _: None
+            )
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "entity_id",
+    [
+        "climate.test_pilote_v2",
+        "climate.test_glow",
+        "climate.test_bloom",
+        "climate.test_pilote_pro",
+    ],
+)
+async def test_coordinator_update(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+    benchmark_results,
+    entity_id: str,
+):
+    """Decode and write a changed thermostat, against the property path."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    entity = hass.data[CLIM_DOMAIN].get_entity(entity_id)
+    device = coordinator.data[entity.device_id]
+    modes = [
+        entity.entity_description.ha_to_heatzy_state[preset]
+        for preset in (PRESET_ECO, PRESET_COMFORT)
+    ]
+
+    def update(write) -> None:
+        # Every update changes the preset, no write is skipped
+        for index in range(UPDATES):
+            device[CONF_ATTRS][CONF_MODE] = modes[index % 2]
+            coordinator.states[entity.device_id] = decode_device(device)
+            write()
+
+    name = f"coordinator_update[{entity_id}]"
+    benchmark_results.measure(name, lambda: update(entity._handle_coordinator_update))
+
+    def write_property_path() -> None:
+        # Before the cache, an update only refreshed the device, then wrote
+        entity._device_state = coordinator.async_get_state(entity.device_id)
+        entity.async_write_ha_state()
+
+    _use_property_path(entity)
+    reference = f"coordinator_update_property_path[{entity_id}]"
+    benchmark_results.measure(reference, lambda: update(write_property_path))
+    benchmark_results.speedup(name, reference)
+
+
+@pytest.mark.parametrize("count", ACCOUNT_SIZES)
+async def test_property_evaluation(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    account,
+    benchmark_results,
+    count: int,
+):
+    """Evaluate the properties written by a state write, for each thermostat."""
+    account(count)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    entities = list(hass.data[CLIM_DOMAIN].entities)
+
+    def evaluate() -> None:
+        for entity in entities:
+            entity.state  # noqa: B018
+            entity.state_attributes  # noqa: B018
+
+    duration = benchmark_results.measure(f"climate_properties[{count}]", evaluate)
+    benchmark_results.record(
+        f"climate_properties_per_entity[{count}]", duration / len(entities)
+    )
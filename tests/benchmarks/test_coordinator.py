@@ -0,0 +1,60 @@
+"""Benchmark the set up and the fan-out of the coordinator."""
+
+import time
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.heatzy.const import CONF_ATTRS, CONF_LOCK
+
+from .conftest import ACCOUNT_SIZES
+
+
+@pytest.mark.parametrize("count", ACCOUNT_SIZES)
+async def test_setup(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    account,
+    benchmark_results,
+    count: int,
+):
+    """Set up the platforms of the account."""
+    account(count)
+
+    start = time.perf_counter()
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    benchmark_results.record(f"setup[{count}]", time.perf_counter() - start)
+
+    coordinator = config_entry.runtime_data
+    assert len(coordinator.data) == count
+    assert set(coordinator.platforms) >= {"climate", "number", "sensor", "switch"}
+
+
+@pytest.mark.parametrize("count", ACCOUNT_SIZES)
+async def test_set_updated_data(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    account,
+    benchmark_results,
+    count: int,
+):
+    """Update the listeners when one device or all the devices change."""
+    devices = account(count)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    first = next(iter(devices.values()))
+
+    def one_changed() -> None:
+        first[CONF_ATTRS][CONF_LOCK] = 1 - first[CONF_ATTRS].get(CONF_LOCK, 0)
+        coordinator.async_set_updated_data(devices)
+
+    def all_changed() -> None:
+        for device in devices.values():
+            device[CONF_ATTRS][CONF_LOCK] = 1 - device[CONF_ATTRS].get(CONF_LOCK, 0)
+        coordinator.async_set_updated_data(devices)
+
+    benchmark_results.measure(f"set_updated_data[one][{count}]", one_changed)
+    benchmark_results.measure(f"set_updated_data[all][{count}]", all_changed)
@@ -0,0 +1,59 @@
+"""Load test the integration against the local Heatzy cloud.
+
+Skipped with the other benchmarks unless HEATZY_BENCHMARK is set.
+"""
+
+import asyncio
+import time
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.heatzy.const import CONF_ATTRS
+
+from ..cloud_server import HeatzyCloud
+
+pytestmark = [
+    pytest.mark.usefixtures("socket_enabled"),
+    pytest.mark.parametrize("expected_lingering_tasks", [True]),
+]
+
+# Devices of each product, eight products in the fixture
+DEVICES_PER_PRODUCT = 250
+
+
+async def test_load(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    heatzy_cloud: HeatzyCloud,
+    benchmark_results,
+) -> None:
+    """Set up thousands of devices, then push a frame to each of them."""
+    heatzy_cloud.populate(DEVICES_PER_PRODUCT)
+    count = len(heatzy_cloud.devices)
+
+    start = time.perf_counter()
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    async with asyncio.timeout(60):
+        while not coordinator.websocket_healthy:
+            await asyncio.sleep(0.01)
+    benchmark_results.record(f"load_setup[{count}]", time.perf_counter() - start)
+
+    assert len(coordinator.data) == count
+
+    start = time.perf_counter()
+    for did, device in heatzy_cloud.devices.items():
+        device[CONF_ATTRS]["lock_switch"] = 1
+        await heatzy_cloud.push(did)
+    async with asyncio.timeout(60):
+        while any(
+            device[CONF_ATTRS].get("lock_switch") != 1
+            for device in coordinator.data.values()
+        ):
+            await asyncio.sleep(0.01)
+    benchmark_results.record(f"load_frames[{count}]", time.perf_counter() - start)
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
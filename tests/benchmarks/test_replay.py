@@ -0,0 +1,48 @@
+"""Benchmark the frames of a capture replayed into the coordinator."""
+
+import copy
+import gzip
+import json
+import time
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.heatzy.const import CONF_ATTRS, CONF_MODE
+from custom_components.heatzy.recorder import async_replay
+
+from .conftest import ACCOUNT_SIZES
+
+MODES = ("eco", "fro", "cft")
+
+
+@pytest.mark.parametrize("count", ACCOUNT_SIZES)
+async def test_replay_storm(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    account,
+    benchmark_results,
+    tmp_path,
+    count: int,
+):
+    """Replay a storm of frames, each device changing three times."""
+    devices = account(count)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    path = tmp_path / "capture.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        for index, mode in enumerate(MODES):
+            for device in devices.values():
+                frame = copy.deepcopy(device)
+                frame[CONF_ATTRS][CONF_MODE] = mode
+                file.write(json.dumps({"t": index, "frame": frame}) + "\n")
+
+    coordinator = config_entry.runtime_data
+    start = time.perf_counter()
+    frames = await async_replay(coordinator, str(path), None)
+    duration = time.perf_counter() - start
+
+    assert frames == len(MODES) * count
+    benchmark_results.record(f"replay_per_frame[{count}]", duration / frames)
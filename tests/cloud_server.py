@@ -0,0 +1,197 @@
+"""Heatzy cloud served on localhost, for end to end and load tests.
+
+It serves the HTTP endpoints and the websocket used by heatzypy. The client
+reaches it through a session resolving the cloud hosts to the local server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import socket
+import time
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector, WSMsgType, web
+from aiohttp.abc import AbstractResolver, ResolveResult
+
+from custom_components.heatzy.const import CONF_ALIAS, CONF_ATTRS, CONF_CUR_MODE
+
+TOKEN = "heatzy-cloud-token"
+TOKEN_LIFETIME = 3600
+
+
+class CloudResolver(AbstractResolver):
+    """Resolve every host and port to the local cloud."""
+
+    def __init__(self, port: int) -> None:
+        """Initialize."""
+        self.port = port
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> list[ResolveResult]:
+        """Return the address of the local cloud."""
+        return [
+            {
+                "hostname": host,
+                "host": "127.0.0.1",
+                "port": self.port,
+                "family": socket.AF_INET,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            }
+        ]
+
+    async def close(self) -> None:
+        """Release the resolver."""
+
+
+class HeatzyCloud:
+    """Simulate the devices of an account and their websocket frames."""
+
+    def __init__(self, templates: dict[str, dict[str, Any]]) -> None:
+        """Initialize with the devices of the account."""
+        self.templates = templates
+        self.devices: dict[str, dict[str, Any]] = copy.deepcopy(templates)
+        self.commands: list[tuple[str, dict[str, Any]]] = []
+        # Seconds before a command is echoed by the device
+        self.latency = 0.0
+        self.port = 0
+        self._clients: set[web.WebSocketResponse] = set()
+        self._runner: web.AppRunner | None = None
+
+    def populate(self, count: int) -> None:
+        """Simulate count devices of each product."""
+        self.devices = {}
+        for template in self.templates.values():
+            for index in range(count):
+                did = f"{template['did'][:14]}{index:08d}"
+                device = copy.deepcopy(template)
+                device["did"] = did
+                device[CONF_ALIAS] = f"{template[CONF_ALIAS]} {index}"
+                self.devices[did] = device
+
+    async def start(self) -> None:
+        """Serve the cloud on a free port."""
+        app = web.Application()
+        app.router.add_post("/app/login", self._login)
+        app.router.add_get("/app/bindings", self._bindings)
+        app.router.add_get("/app/devices/{did}", self._device)
+        app.router.add_get("/app/devdata/{did}/latest", self._device_data)
+        app.router.add_post("/app/control/{did}", self._control)
+        app.router.add_get("/ws/app/v1", self._websocket)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Close the websockets and stop serving."""
+        await self.drop()
+        if self._runner:
+            await self._runner.cleanup()
+
+    def create_session(self) -> ClientSession:
+        """Return a session reaching the cloud hosts on the local server."""
+        return ClientSession(connector=TCPConnector(resolver=CloudResolver(self.port)))
+
+    async def drop(self) -> None:
+        """Close the websockets, as the cloud does during an outage."""
+        for client in list(self._clients):
+            await client.close()
+
+    async def push(self, did: str) -> None:
+        """Push the state of a device to the websockets."""
+        device = self.devices[did]
+        frame = {"cmd": "s2c_noti", "data": {"did": did, "attrs": device[CONF_ATTRS]}}
+        for client in list(self._clients):
+            await client.send_json(frame)
+
+    async def control(self, did: str, payload: dict[str, Any]) -> None:
+        """Apply a command to a device, the device echoes its new state."""
+        self.commands.append((did, payload))
+        attrs = self.devices[did][CONF_ATTRS]
+        changes = payload.get(CONF_ATTRS) or {}
+        attrs.update(changes)
+        if "mode" in changes and CONF_CUR_MODE in attrs:
+            attrs[CONF_CUR_MODE] = changes["mode"]
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        await self.push(did)
+
+    @staticmethod
+    def _binding(device: dict[str, Any]) -> dict[str, Any]:
+        """Return the binding of a device, without its state."""
+        return {key: value for key, value in device.items() if key != CONF_ATTRS}
+
+    def _get_device(self, request: web.Request) -> dict[str, Any]:
+        """Return the device of the request, after checking the token."""
+        if request.headers.get("X-Gizwits-User-Token") != TOKEN:
+            raise web.HTTPUnauthorized
+        if (device := self.devices.get(request.match_info["did"])) is None:
+            raise web.HTTPNotFound
+        return device
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Return a token."""
+        return web.json_response(
+            {"token": TOKEN, "uid": "heatzy", "expire_at": time.time() + TOKEN_LIFETIME}
+        )
+
+    async def _bindings(self, request: web.Request) -> web.Response:
+        """Return the devices of the account."""
+        if request.headers.get("X-Gizwits-User-Token") != TOKEN:
+            raise web.HTTPUnauthorized
+        return web.json_response(
+            {"devices": [self._binding(device) for device in self.devices.values()]}
+        )
+
+    async def _device(self, request: web.Request) -> web.Response:
+        """Return a device."""
+        return web.json_response(self._binding(self._get_device(request)))
+
+    async def _device_data(self, request: web.Request) -> web.Response:
+        """Return the state of a device."""
+        device = self._get_device(request)
+        return web.json_response(
+            {"did": device["did"], "updated_at": 0, "attr": device[CONF_ATTRS]}
+        )
+
+    async def _control(self, request: web.Request) -> web.Response:
+        """Control a device through the HTTP API."""
+        device = self._get_device(request)
+        await self.control(device["did"], await request.json())
+        return web.json_response({})
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """Serve the websocket of the account."""
+        client = web.WebSocketResponse()
+        await client.prepare(request)
+        self._clients.add(client)
+        try:
+            async for message in client:
+                if message.type is not WSMsgType.TEXT:
+                    continue
+                frame = message.json()
+                data = frame.get("data") or {}
+                match frame.get("cmd"):
+                    case "login_req":
+                        success = data.get("token") == TOKEN
+                        await client.send_json(
+                            {"cmd": "login_res", "data": {"success": success}}
+                        )
+                    case "ping":
+                        await client.send_json({"cmd": "pong"})
+                    case "c2s_read" if data.get("did") in self.devices:
+                        await self.push(data["did"])
+                    case "c2s_write" | "c2s_raw" if data.get("did") in self.devices:
+                        await self.control(data.pop("did"), data)
+                    case _:
+                        await client.send_json(
+                            {"cmd": "s2c_invalid_msg", "data": {"error": 1, **frame}}
+                        )
+        finally:
+            self._clients.discard(client)
+        return client
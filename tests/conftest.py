@@ -1,8 +1,11 @@
 """The tests for the component."""
 
-from typing import Generator
+import asyncio
+from functools import partial
+from typing import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
+import heatzypy
 import pytest
 from homeassistant.config_entries import SOURCE_USER, ConfigEntry
 from homeassistant.const import CONF_USERNAME
@@ -21,6 +24,7 @@ from custom_components.heatzy.const import (
     DOMAIN,
 )
 
+from .cloud_server import HeatzyCloud
 from .const import MOCK_USER_INPUT
 
 MODE_AUTO = {
@@ -36,6 +40,13 @@ def auto_enable_custom_integrations(enable_custom_integrations):
     yield
 
 
+@pytest.fixture(autouse=True)
+def disable_command_debounce():
+    """Send the commands without waiting for the debounce window."""
+    with patch("custom_components.heatzy.command.DEBOUNCE_COOLDOWN", 0):
+        yield
+
+
 @pytest.fixture(name="HeatzyClient")
 def mock_router(request) -> Generator[MagicMock | AsyncMock]:
     """Mock a successful connection."""
@@ -51,18 +62,23 @@ def mock_router(request) -> Generator[MagicMock | AsyncMock]:
                 cb(api)
         instance.websocket.register_callback = MagicMock(side_effect=_mock_register_callback)
 
+        closed = asyncio.Event()
+
         async def _mock_connect(*args, **kwargs):
             is_connected_prop.return_value = True
+            closed.clear()
         instance.websocket.async_connect = AsyncMock(side_effect=_mock_connect)
 
         async def _mock_listen(*args, **kwargs):
             is_updated_prop.return_value = True
-            return api
+            # Listen until the websocket is closed
+            await closed.wait()
 
         instance.websocket.async_listen = AsyncMock(side_effect=_mock_listen)
         
         async def _mock_disconnect(*args, **kwargs):
             is_connected_prop.return_value = False
+            closed.set()
         instance.websocket.async_disconnect = AsyncMock(side_effect=_mock_disconnect)
 
         type(instance.websocket).is_updated = is_updated_prop
@@ -88,6 +104,29 @@ def mock_router(request) -> Generator[MagicMock | AsyncMock]:
         yield instance
 
 
+@pytest.fixture(name="heatzy_cloud")
+async def mock_cloud() -> AsyncGenerator[HeatzyCloud]:
+    """Serve the Heatzy cloud on localhost, for the real client."""
+    cloud = HeatzyCloud(load_json_object_fixture("Devices.json"))
+    await cloud.start()
+    session = cloud.create_session()
+
+    with (
+        patch(
+            "custom_components.heatzy.coordinator.async_create_clientsession",
+            return_value=session,
+        ),
+        patch(
+            "custom_components.heatzy.coordinator.HeatzyClient",
+            partial(heatzypy.HeatzyClient, use_tls=False),
+        ),
+    ):
+        yield cloud
+
+    await session.close()
+    await cloud.stop()
+
+
 @pytest.fixture(name="config_entry")
 def get_config_entry(hass: HomeAssistant) -> ConfigEntry:
     """Create and register mock config entry."""
@@ -21,8 +21,13 @@ from homeassistant.components.climate import DOMAIN as CLIM_DOMAIN
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import entity_registry as er
 
+from custom_components.heatzy.climate import CLIMATE_INDEX, CLIMATE_TYPES
 from custom_components.heatzy.const import (
+    CONF_ATTRS,
+    CONF_ZONES,
+    DOMAIN,
     PRESET_COMFORT_1,
     PRESET_COMFORT_2,
     PRESET_VACATION,
@@ -290,3 +295,95 @@ async def test_current_humidity(
     await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
     assert hass.states.get(entity_id).attributes[ATTR_CURRENT_HUMIDITY] is not None  
+
+
+def test_climate_index():
+    """Each product maps to the descriptions supporting it."""
+    for description in CLIMATE_TYPES:
+        for product_key in description.products:
+            assert description in CLIMATE_INDEX[product_key]
+    assert sum(len(items) for items in CLIMATE_INDEX.values()) == sum(
+        len(description.products) for description in CLIMATE_TYPES
+    )
+
+
+async def test_zone(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """A zone follows its members and sends the commands to all of them."""
+    dids = ["gizrKSNGrryMk9gAjWKFD3", "DEiP7Sv17MMqRahsjb0oCb", "w5kwiwansHT0BlDiNQtzu7"]
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_ZONES: {"Bedrooms": dids}}
+    )
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        CLIM_DOMAIN, DOMAIN, f"{config_entry.entry_id}_zone_bedrooms"
+    )
+    state = hass.states.get(entity_id)
+    assert state.attributes["entity_id"] == [
+        "climate.test_pilote_v2",
+        "climate.test_pilote_v3",
+        "climate.test_pilote_v4",
+    ]
+    assert PRESET_COMFORT_1 not in state.attributes["preset_modes"]
+
+    await hass.services.async_call(
+        CLIM_DOMAIN,
+        SERVICE_SET_PRESET_MODE,
+        {ATTR_ENTITY_ID: entity_id, ATTR_PRESET_MODE: PRESET_ECO},
+        blocking=True,
+    )
+    assert HeatzyClient.websocket.async_control_device.await_count == 3
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).attributes[ATTR_PRESET_MODE] == PRESET_ECO
+    assert hass.states.get("climate.test_pilote_v3").attributes[ATTR_PRESET_MODE] == PRESET_ECO
+
+
+class CountingDict(dict):
+    """Attributes of a device counting their lookups."""
+
+    lookups = 0
+
+    def get(self, key, default=None):
+        """Count the lookup."""
+        self.lookups += 1
+        return super().get(key, default)
+
+
+@pytest.mark.parametrize(
+    ("entity_id", "max_lookups"),
+    [
+        ("climate.test_pilote_v2", 5),
+        ("climate.test_glow", 12),
+        ("climate.test_bloom", 8),
+        ("climate.test_pilote_pro", 14),
+    ],
+)
+async def test_attributes_decoded_once(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+    entity_id: str,
+    max_lookups: int,
+):
+    """The attributes are decoded once per frame, not per entity or property."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    entity = hass.data[CLIM_DOMAIN].get_entity(entity_id)
+    device = coordinator.data[entity.device_id]
+    device[CONF_ATTRS] = attrs = CountingDict(device[CONF_ATTRS])
+
+    # All the entities of the device share the decoded state
+    coordinator.async_update_listeners()
+    assert attrs.lookups <= max_lookups
+
+    lookups = attrs.lookups
+    entity._handle_coordinator_update()
+    entity.state_attributes  # noqa: B018
+    assert attrs.lookups == lookups
@@ -0,0 +1,87 @@
+"""End to end tests against the local Heatzy cloud."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from homeassistant.components.climate import (
+    ATTR_PRESET_MODE,
+    PRESET_ECO,
+    SERVICE_SET_PRESET_MODE,
+)
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from custom_components.heatzy.const import CONF_ATTRS
+
+from .cloud_server import HeatzyCloud
+
+# The cloud listens on localhost and heatzypy keeps its heartbeat task running
+pytestmark = [
+    pytest.mark.usefixtures("socket_enabled"),
+    pytest.mark.parametrize("expected_lingering_tasks", [True]),
+]
+
+DID = "gizrKSNGrryMk9gAjWKFD3"
+
+
+async def _wait_for(condition, timeout: float = 5) -> None:
+    """Wait until the condition is met."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+async def test_control_echo(
+    hass: HomeAssistant, config_entry: ConfigEntry, heatzy_cloud: HeatzyCloud
+) -> None:
+    """The commands reach the cloud and the echo confirms them."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    await _wait_for(lambda: coordinator.websocket_healthy)
+
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_PRESET_MODE,
+        {ATTR_ENTITY_ID: "climate.test_pilote_v2", ATTR_PRESET_MODE: PRESET_ECO},
+        blocking=True,
+    )
+    await _wait_for(lambda: coordinator.latency.count == 1)
+
+    assert heatzy_cloud.commands == [(DID, {CONF_ATTRS: {"mode": "eco"}})]
+    assert hass.states.get("climate.test_pilote_v2").attributes[ATTR_PRESET_MODE] == (
+        PRESET_ECO
+    )
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_reconnect(
+    hass: HomeAssistant, config_entry: ConfigEntry, heatzy_cloud: HeatzyCloud
+) -> None:
+    """The websocket reconnects after the cloud closed it."""
+    with patch("custom_components.heatzy.coordinator.RECONNECT_MIN", 0):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = config_entry.runtime_data
+        await _wait_for(lambda: coordinator.websocket_healthy)
+
+        await heatzy_cloud.drop()
+        await _wait_for(lambda: coordinator.reconnects == 1)
+        await _wait_for(lambda: coordinator.websocket_healthy)
+
+        heatzy_cloud.devices[DID][CONF_ATTRS]["mode"] = "eco"
+        await heatzy_cloud.push(DID)
+        await _wait_for(
+            lambda: (
+                hass.states.get("climate.test_pilote_v2").attributes.get(
+                    ATTR_PRESET_MODE
+                )
+                == PRESET_ECO
+            )
+        )
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
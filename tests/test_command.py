@@ -0,0 +1,88 @@
+"""Tests for the Heatzy command queue."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, call
+
+from heatzypy.exception import HeatzyException
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.heatzy.command import HeatzyCommandQueue, TokenBucket
+from custom_components.heatzy.const import CONF_ATTRS
+
+
+async def test_commands_coalesced(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+):
+    """Commands within the window are merged, the last writer wins."""
+    queue = HeatzyCommandQueue(hass, config_entry)
+    queue.cooldown = 0.01
+    send = AsyncMock()
+
+    await queue.async_send("did1", {CONF_ATTRS: {"mode": "eco"}}, send)
+    await queue.async_send("did1", {CONF_ATTRS: {"mode": "cft", "lock": 1}}, send)
+    await queue.async_send("did2", {CONF_ATTRS: {"mode": "fro"}}, send)
+    send.assert_not_awaited()
+
+    await asyncio.sleep(0.05)
+    assert send.await_args_list == [
+        call("did1", {CONF_ATTRS: {"mode": "cft", "lock": 1}}),
+        call("did2", {CONF_ATTRS: {"mode": "fro"}}),
+    ]
+
+
+async def test_raw_command_not_coalesced(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+):
+    """Raw commands are sent right away and errors are logged."""
+    on_sent = MagicMock()
+    on_failure = MagicMock()
+    queue = HeatzyCommandQueue(
+        hass, config_entry, on_sent=on_sent, on_failure=on_failure
+    )
+    queue.cooldown = 0.01
+    send = AsyncMock(side_effect=HeatzyException("boom"))
+
+    await queue.async_send("did1", {"raw": [1, 1, 0]}, send, "Error raw")
+    send.assert_awaited_once_with("did1", {"raw": [1, 1, 0]})
+    assert queue.counters.command_failures == 1
+    assert queue.counters.command_successes == 0
+    on_sent.assert_called_once_with("did1")
+    on_failure.assert_called_once_with("did1")
+
+
+async def test_commands_ordered_per_device(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+):
+    """Concurrent commands for a device are sent one after the other."""
+    queue = HeatzyCommandQueue(hass, config_entry)
+    sent = []
+
+    async def _send(did, config):
+        sent.append(config[CONF_ATTRS]["mode"])
+        await asyncio.sleep(0)
+        sent.append(None)
+
+    await asyncio.gather(
+        *(
+            queue.async_send("did1", {CONF_ATTRS: {"mode": mode}}, _send)
+            for mode in ("eco", "cft", "fro")
+        )
+    )
+    assert sent == ["eco", None, "cft", None, "fro", None]
+
+
+async def test_token_bucket_limits_rate():
+    """Tokens are refilled at the configured rate."""
+    bucket = TokenBucket(rate=100, capacity=2)
+    await bucket.async_acquire()
+    await bucket.async_acquire()
+
+    task = asyncio.create_task(bucket.async_acquire())
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    await asyncio.wait_for(task, 1)
@@ -1,20 +1,42 @@
 """Tests for the Heatzy coordinator."""
 
 import asyncio
-from unittest.mock import AsyncMock, PropertyMock
+import copy
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
+import aiohttp
 import pytest
 from heatzypy.exception import (
     AuthenticationFailed,
     ConnectionFailed,
     HeatzyException,
 )
+from homeassistant.components.climate import (
+    ATTR_PRESET_MODE,
+    PRESET_COMFORT,
+    PRESET_ECO,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.const import ATTR_ASSUMED_STATE, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    load_json_object_fixture,
+)
 
-from custom_components.heatzy.coordinator import HeatzyDataUpdateCoordinator
+from custom_components.heatzy.const import DOMAIN
+from custom_components.heatzy.coordinator import (
+    CONFIRM_TIMEOUT,
+    POLL_INTERVAL_MIN,
+    SCAN_INTERVAL,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+    HeatzyDataUpdateCoordinator,
+)
 
 
 async def test_setup_success(
@@ -142,3 +164,456 @@ async def test_websocket_closed_on_hass_stop(
 
     assert coordinator.unsub is None
     coordinator.api.websocket.async_disconnect.assert_awaited()
+
+
+async def test_websocket_notifies_changed_devices_only(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """A websocket frame only wakes the listeners of the devices that changed."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    changed, untouched = MagicMock(), MagicMock()
+    coordinator.async_add_device_listener("gizrKSNGrryMk9gAjWKFD3", changed)
+    coordinator.async_add_device_listener("DEiP7Sv17MMqRahsjb0oCb", untouched)
+
+    device = copy.deepcopy(coordinator.data["gizrKSNGrryMk9gAjWKFD3"])
+    device["attrs"]["mode"] = "eco"
+    coordinator._async_handle_websocket_data(device)
+
+    changed.assert_called_once()
+    untouched.assert_not_called()
+    assert coordinator.data["gizrKSNGrryMk9gAjWKFD3"]["attrs"]["mode"] == "eco"
+
+    # The same payload again is not a change.
+    frames = len(coordinator.frame_buffer.frames)
+    duplicates = coordinator.counters.duplicates
+    coordinator._async_handle_websocket_data(copy.deepcopy(device))
+    changed.assert_called_once()
+    assert coordinator.counters.duplicates == duplicates + 1
+    assert len(coordinator.frame_buffer.frames) == frames
+
+
+async def test_websocket_reconnects_with_backoff(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """The supervisor reconnects with an exponential, jittered backoff."""
+    coordinator = HeatzyDataUpdateCoordinator(hass, config_entry)
+    await coordinator._async_setup()
+
+    block = asyncio.Event()
+
+    async def _blocking_listen(*args, **kwargs):
+        await block.wait()
+
+    coordinator.api.websocket.async_listen = AsyncMock(side_effect=_blocking_listen)
+    coordinator.api.websocket.async_connect = AsyncMock(
+        side_effect=[ConnectionFailed("down"), ConnectionFailed("down"), None]
+    )
+
+    with patch(
+        "custom_components.heatzy.coordinator.random.uniform", return_value=0
+    ) as uniform:
+        coordinator._init_websocket()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    assert coordinator.reconnects == 2
+    assert coordinator.api.websocket.async_connect.await_count == 3
+    assert [call.args for call in uniform.call_args_list] == [(0, 1), (0, 2)]
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    block.set()
+    await hass.async_block_till_done()
+    assert coordinator.unsub is None
+
+
+async def test_websocket_reconnects_after_unexpected_error(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Errors outside of heatzypy do not end the supervisor."""
+    coordinator = HeatzyDataUpdateCoordinator(hass, config_entry)
+    await coordinator._async_setup()
+
+    block = asyncio.Event()
+
+    async def _blocking_listen(*args, **kwargs):
+        await block.wait()
+
+    coordinator.api.websocket.async_listen = AsyncMock(side_effect=_blocking_listen)
+    coordinator.api.websocket.async_connect = AsyncMock(
+        side_effect=[aiohttp.ClientError("reset"), TimeoutError(), None]
+    )
+
+    with patch("custom_components.heatzy.coordinator.random.uniform", return_value=0):
+        coordinator._init_websocket()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    assert coordinator.reconnects == 2
+    assert coordinator.api.websocket.async_connect.await_count == 3
+    assert coordinator.unsub is not None
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    block.set()
+    await hass.async_block_till_done()
+    assert coordinator.unsub is None
+
+
+async def test_websocket_supervisor_survives_disconnect_error(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """A failing disconnect is logged and the supervisor reconnects."""
+    coordinator = HeatzyDataUpdateCoordinator(hass, config_entry)
+    await coordinator._async_setup()
+
+    block = asyncio.Event()
+
+    async def _blocking_listen(*args, **kwargs):
+        await block.wait()
+
+    coordinator.api.websocket.async_listen = AsyncMock(side_effect=_blocking_listen)
+    coordinator.api.websocket.async_connect = AsyncMock(
+        side_effect=[ConnectionFailed("down"), None]
+    )
+    coordinator.api.websocket.async_disconnect = AsyncMock(
+        side_effect=[RuntimeError("closed"), None, None]
+    )
+
+    with patch("custom_components.heatzy.coordinator.random.uniform", return_value=0):
+        coordinator._init_websocket()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    assert coordinator.reconnects == 1
+    assert coordinator.api.websocket.async_connect.await_count == 2
+    assert coordinator.unsub is not None
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    block.set()
+    await hass.async_block_till_done()
+    assert coordinator.unsub is None
+
+
+async def test_websocket_closed_on_unload(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Unloading stops the supervisor and closes the websocket once."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    assert coordinator.unsub is not None
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert coordinator.unsub is None
+    HeatzyClient.websocket.async_disconnect.assert_awaited()
+    assert "Unable to remove unknown job listener" not in caplog.text
+
+    # Safe to call again
+    await coordinator.async_stop_websocket()
+
+
+async def test_polling_follows_websocket_health(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Polling is suspended while the websocket is healthy and decays when down."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    assert coordinator.websocket_healthy is True
+
+    coordinator._async_handle_websocket_data(coordinator.data)
+    assert coordinator.update_interval is None
+
+    # Websocket drops: poll fast, then slow down up to the scan interval.
+    with patch(
+        "custom_components.heatzy.coordinator.random.uniform", return_value=60
+    ):
+        await coordinator.api.websocket.async_disconnect()
+        coordinator._async_check_liveness()
+        assert coordinator.update_interval == timedelta(seconds=POLL_INTERVAL_MIN)
+
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(
+            seconds=POLL_INTERVAL_MIN * 2
+        )
+        coordinator.api.async_get_devices.assert_awaited()
+
+        for _ in range(5):
+            await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=SCAN_INTERVAL)
+
+
+async def test_optimistic_state_confirmed(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Commanded attributes are shown at once and confirmed by the echo."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    coordinator.async_set_optimistic("gizrKSNGrryMk9gAjWKFD3", {"mode": "eco"})
+    assert (
+        hass.states.get("climate.test_pilote_v2").attributes[ATTR_PRESET_MODE]
+        == PRESET_ECO
+    )
+
+    # A stale frame does not revert the optimistic state.
+    device = copy.deepcopy(coordinator.data["gizrKSNGrryMk9gAjWKFD3"])
+    device["attrs"]["mode"] = "cft"
+    device["attrs"]["lock_switch"] = 1
+    coordinator._async_handle_websocket_data(device)
+    assert coordinator.data["gizrKSNGrryMk9gAjWKFD3"]["attrs"]["mode"] == "eco"
+
+    device = copy.deepcopy(device)
+    device["attrs"]["mode"] = "eco"
+    coordinator._async_handle_websocket_data(device)
+    assert coordinator._optimistic == {}
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=CONFIRM_TIMEOUT))
+    await hass.async_block_till_done()
+    assert coordinator.data["gizrKSNGrryMk9gAjWKFD3"]["attrs"]["mode"] == "eco"
+
+
+async def test_optimistic_state_rolled_back(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+    caplog: pytest.LogCaptureFixture,
+):
+    """The reported state is restored when the device ignores a command."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    coordinator.async_set_optimistic("gizrKSNGrryMk9gAjWKFD3", {"mode": "eco"})
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=CONFIRM_TIMEOUT))
+    await hass.async_block_till_done()
+
+    assert (
+        hass.states.get("climate.test_pilote_v2").attributes[ATTR_PRESET_MODE]
+        == PRESET_COMFORT
+    )
+    assert "did not confirm" in caplog.text
+
+
+async def test_optimistic_state_not_confirmed_by_duplicate(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+    caplog: pytest.LogCaptureFixture,
+):
+    """A frame repeating the reported state does not confirm a command."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    reported = copy.deepcopy(coordinator.data["gizrKSNGrryMk9gAjWKFD3"])
+    coordinator.async_set_optimistic("gizrKSNGrryMk9gAjWKFD3", {"mode": "eco"})
+
+    # A heartbeat arrives before the echo, and the echo never comes
+    coordinator._async_handle_websocket_data(copy.deepcopy(reported))
+    assert coordinator._optimistic == {"gizrKSNGrryMk9gAjWKFD3": {"mode": "eco"}}
+    assert coordinator.latency.count == 0
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=CONFIRM_TIMEOUT))
+    await hass.async_block_till_done()
+
+    assert (
+        hass.states.get("climate.test_pilote_v2").attributes[ATTR_PRESET_MODE]
+        == PRESET_COMFORT
+    )
+    assert coordinator.latency.timeouts == 1
+    assert "did not confirm" in caplog.text
+
+
+async def test_snapshot_saved(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+    hass_storage: dict[str, Any],
+):
+    """The last known devices are saved after an update."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY))
+    await hass.async_block_till_done()
+
+    snapshot = hass_storage[f"{DOMAIN}.{config_entry.entry_id}"]["data"]
+    assert snapshot["gizrKSNGrryMk9gAjWKFD3"]["attrs"]["mode"] == "cft"
+    assert "passcode" not in snapshot["gizrKSNGrryMk9gAjWKFD3"]
+
+
+async def test_setup_from_snapshot(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+    hass_storage: dict[str, Any],
+):
+    """Entities are created from the snapshot while the cloud is slow."""
+    devices = load_json_object_fixture("Devices.json")
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": devices,
+    }
+
+    block = asyncio.Event()
+
+    async def _slow_cloud(*args, **kwargs):
+        await block.wait()
+        return devices
+
+    HeatzyClient.async_get_devices = AsyncMock(side_effect=_slow_cloud)
+    HeatzyClient.websocket.async_connect = AsyncMock(side_effect=_slow_cloud)
+    HeatzyClient.websocket.register_callback = MagicMock()
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.test_pilote_v2")
+    assert state is not None
+    assert state.attributes[ATTR_ASSUMED_STATE] is True
+
+    block.set()
+    await config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.test_pilote_v2")
+    assert ATTR_ASSUMED_STATE not in state.attributes
+
+
+async def test_platforms_follow_products(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Only the platforms with entities are set up, a new product adds them."""
+    devices = load_json_object_fixture("Devices.json")
+    pilote_v1 = {"AKcJWxXqnqrlTip2CB6buh": devices["AKcJWxXqnqrlTip2CB6buh"]}
+    HeatzyClient.async_get_devices = AsyncMock(return_value=pilote_v1)
+    HeatzyClient.websocket.register_callback = MagicMock()
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    assert coordinator.platforms == ["climate", "number", "sensor"]
+    assert not hass.states.async_entity_ids("switch")
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        coordinator.async_set_updated_data(devices)
+    mock_reload.assert_called_once_with(config_entry.entry_id)
+
+
+async def test_platforms_follow_websocket_devices(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """A device bound while polling is suspended adds its platforms."""
+    devices = load_json_object_fixture("Devices.json")
+    pilote_v1 = {"AKcJWxXqnqrlTip2CB6buh": devices["AKcJWxXqnqrlTip2CB6buh"]}
+    HeatzyClient.async_get_devices = AsyncMock(return_value=pilote_v1)
+    HeatzyClient.websocket.register_callback = MagicMock()
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        # A known device does not reload
+        coordinator._async_handle_websocket_data(
+            copy.deepcopy(devices["AKcJWxXqnqrlTip2CB6buh"])
+        )
+        mock_reload.assert_not_called()
+        coordinator._async_handle_websocket_data(devices["6wHqU2TvH0YUUZVhdfLhi6"])
+    mock_reload.assert_called_once_with(config_entry.entry_id)
+
+
+async def test_poll_keeps_fresher_frames(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """A frame pushed during a poll is not overwritten by its older response."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    did = "gizrKSNGrryMk9gAjWKFD3"
+    stale = copy.deepcopy(coordinator.data)
+    stale[did]["attrs"]["mode"] = "fro"
+    stale[did]["attrs"]["lock_switch"] = 1
+    stale["DEiP7Sv17MMqRahsjb0oCb"]["attrs"]["mode"] = "eco"
+
+    async def _get_devices():
+        # The websocket pushes the new mode while the poll is in flight
+        frame = copy.deepcopy(coordinator.data[did])
+        frame["attrs"]["mode"] = "eco"
+        del frame["attrs"]["lock_switch"]
+        coordinator._async_handle_websocket_data(frame)
+        return copy.deepcopy(stale)
+
+    HeatzyClient.async_get_devices = AsyncMock(side_effect=_get_devices)
+    type(coordinator.api.websocket).is_updated = PropertyMock(return_value=False)
+
+    data = await coordinator._async_update_data()
+
+    assert data[did]["attrs"]["mode"] == "eco"
+    # Attributes missing from the frame come from the poll
+    assert data[did]["attrs"]["lock_switch"] == 1
+    assert data["DEiP7Sv17MMqRahsjb0oCb"]["attrs"]["mode"] == "eco"
+
+
+async def test_poll_ignores_optimistic_state(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """A poll merges the frames as reported, not the commanded attributes."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    did = "gizrKSNGrryMk9gAjWKFD3"
+    reported = copy.deepcopy(coordinator.data[did])
+    coordinator.async_set_optimistic(did, {"mode": "eco"})
+
+    async def _get_devices():
+        # The device reports its lock, not the commanded mode
+        frame = copy.deepcopy(reported)
+        frame["attrs"]["lock_switch"] = 1
+        coordinator._async_handle_websocket_data(frame)
+        return copy.deepcopy({did: reported})
+
+    HeatzyClient.async_get_devices = AsyncMock(side_effect=_get_devices)
+    type(coordinator.api.websocket).is_updated = PropertyMock(return_value=False)
+
+    data = await coordinator._async_update_data()
+
+    assert data[did]["attrs"]["lock_switch"] == 1
+    # Still waiting for the echo, shown over the reported mode
+    assert coordinator._optimistic == {did: {"mode": "eco"}}
+    assert data[did]["attrs"]["mode"] == "eco"
+
@@ -1,15 +1,20 @@
 """Tests for the Heatzy diagnostics."""
 
 import copy
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
+from heatzypy.exception import HeatzyException
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import load_json_object_fixture
 
+from custom_components.heatzy.const import CONF_ATTRS, CONF_MODE, DOMAIN
 from custom_components.heatzy.diagnostics import (
     async_get_config_entry_diagnostics,
 )
+from custom_components.heatzy.services import SERVICE_PROBE
+
+DID = "gizrKSNGrryMk9gAjWKFD3"
 
 
 async def test_diagnostics(
@@ -17,63 +22,92 @@ async def test_diagnostics(
     config_entry: ConfigEntry,
     HeatzyClient: AsyncMock,
 ):
-    """Test diagnostics returns redacted entry, bindings and devices."""
+    """Test diagnostics returns redacted entry, bindings and the buffer."""
     await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
 
-    devices = copy.deepcopy(load_json_object_fixture("Devices.json"))
-    HeatzyClient.websocket.async_get_devices = AsyncMock(return_value=devices)
     HeatzyClient.async_bindings = AsyncMock(
         return_value={"devices": [{"mac": "aa:bb", "did": "x"}]}
     )
+    coordinator = config_entry.runtime_data
+    echo = copy.deepcopy(coordinator.data[DID])
+    echo[CONF_ATTRS][CONF_MODE] = "eco"
+    coordinator.async_set_optimistic(DID, {CONF_MODE: "eco"})
+    coordinator._async_handle_websocket_data(echo)
 
-    # Invoke the registered callback so pushed updates are collected.
-    HeatzyClient.websocket.register_callback = MagicMock(
-        side_effect=lambda cb: cb({"update": True})
-    )
-
-    with patch(
-        "custom_components.heatzy.diagnostics.asyncio.sleep", new=AsyncMock()
-    ):
-        result = await async_get_config_entry_diagnostics(hass, config_entry)
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
 
     assert set(result) == {
         "entry",
         "bindings",
         "devices",
-        "errors",
-        "callbacks",
+        "frames",
+        "commands",
+        "probe",
+        "counters",
+        "latency",
     }
     assert result["entry"]["data"]["username"] == "**REDACTED**"
     assert result["entry"]["data"]["password"] == "**REDACTED**"
     assert result["bindings"]["devices"][0]["mac"] == "**REDACTED**"
     assert result["devices"]
-    assert result["errors"] == []
-    assert result["callbacks"] == [{"update": True}]
-    # Each device toggles mode twice via the websocket control.
-    assert HeatzyClient.websocket.async_control_device.await_count == len(devices) * 2
+    assert result["frames"][-1]["did"] == DID
+    assert result["commands"][-1]["attrs"] == {CONF_MODE: "eco"}
+    assert result["commands"][-1]["echo"] is not None
+    assert result["latency"]["account"]["timeouts"] == 0
+    # The download is passive, the devices are only probed by the service
+    assert result["probe"] == {}
+    HeatzyClient.websocket.async_control_device.assert_not_awaited()
 
 
-async def test_diagnostics_collects_errors(
+async def test_diagnostics_probe(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     HeatzyClient: AsyncMock,
 ):
-    """Exceptions during device control are collected in the errors list."""
+    """The service probes silent devices in parallel with their current mode."""
     await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
 
-    devices = copy.deepcopy(load_json_object_fixture("Devices.json"))
-    HeatzyClient.websocket.async_get_devices = AsyncMock(return_value=devices)
-    HeatzyClient.async_bindings = AsyncMock(return_value={})
-    HeatzyClient.websocket.async_control_device = AsyncMock(
-        side_effect=Exception("control failed")
-    )
+    coordinator = config_entry.runtime_data
+    coordinator.frame_buffer.frames.clear()
+    devices = {
+        did: device
+        for did, device in coordinator.data.items()
+        if device[CONF_ATTRS].get(CONF_MODE) is not None
+    }
+
+    async def _control(did, config):
+        if did == DID:
+            raise HeatzyException("offline")
+        # Every device but the first one echoes the command
+        if did != next(iter(devices)):
+            coordinator._async_handle_websocket_data(
+                copy.deepcopy(coordinator.data[did])
+            )
 
-    with patch(
-        "custom_components.heatzy.diagnostics.asyncio.sleep", new=AsyncMock()
-    ):
-        result = await async_get_config_entry_diagnostics(hass, config_entry)
+    HeatzyClient.websocket.async_control_device.side_effect = _control
 
-    assert len(result["errors"]) == 1
-    HeatzyClient.websocket.unregister_callback.assert_called_once()
+    with patch("custom_components.heatzy.diagnostics.PROBE_TIMEOUT", 0.01):
+        probe = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROBE,
+            {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id},
+            blocking=True,
+            return_response=True,
+        )
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert result["probe"] == probe
+    assert set(result["probe"]) == set(devices)
+    assert result["probe"][DID] == {"error": "offline"}
+    assert result["probe"][next(iter(devices))] == {"echo": None}
+    for did, device in devices.items():
+        HeatzyClient.websocket.async_control_device.assert_any_await(
+            did, {CONF_ATTRS: {CONF_MODE: device[CONF_ATTRS][CONF_MODE]}}
+        )
+    assert all(
+        probe["echo"] is not None
+        for did, probe in result["probe"].items()
+        if did not in (DID, next(iter(devices)))
+    )
@@ -0,0 +1,46 @@
+"""Tests for the Heatzy device states."""
+
+from pytest_homeassistant_custom_component.common import load_json_object_fixture
+
+from custom_components.heatzy.models import (
+    BloomState,
+    GlowState,
+    HeatzyDeviceState,
+    PiloteProState,
+    PiloteV1State,
+    decode_device,
+)
+
+
+def test_decode_devices():
+    """Each product family decodes its own attributes."""
+    devices = load_json_object_fixture("Devices.json")
+    states = {did: decode_device(device) for did, device in devices.items()}
+
+    assert type(states["AKcJWxXqnqrlTip2CB6buh"]) is PiloteV1State
+    assert type(states["gizrKSNGrryMk9gAjWKFD3"]) is HeatzyDeviceState
+    assert states["gizrKSNGrryMk9gAjWKFD3"].mode == "cft"
+
+    bloom = states["n9QPA2tman3E0x7MmkR4OB"]
+    assert type(bloom) is BloomState
+    assert (bloom.eco_temperature, bloom.comfort_temperature) == (13, 16)
+    assert bloom.timer is True
+
+    glow = states["WRXYsodT9jmamVfRV8WFxy"]
+    assert type(glow) is GlowState
+    assert glow.current_temperature == 19.6
+    assert (glow.eco_temperature, glow.comfort_temperature) == (18.0, 22.0)
+
+    pro = states["6wHqU2TvH0YUUZVhdfLhi6"]
+    assert type(pro) is PiloteProState
+    assert pro.stopped is True
+    assert pro.current_humidity == 57
+    assert pro.current_temperature == 18.5
+
+
+def test_decode_unknown_product():
+    """Unknown products fall back to the Pilote state."""
+    state = decode_device({"product_key": "unknown", "attrs": {"mode": "stop"}})
+    assert type(state) is HeatzyDeviceState
+    assert state.stopped is True
+    assert not hasattr(state, "__dict__")
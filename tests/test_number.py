@@ -1,10 +1,27 @@
+from datetime import timedelta
+from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
+from homeassistant.components.climate import ATTR_PRESET_MODE, SERVICE_SET_PRESET_MODE
+from homeassistant.components.climate import DOMAIN as CLIM_DOMAIN
 from homeassistant.components.number import ATTR_VALUE, SERVICE_SET_VALUE
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_ENTITY_ID, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.heatzy.const import (
+    ATTR_BOOST,
+    ATTR_VACATION,
+    CONF_ATTRS,
+    CONF_DEROG_MODE,
+    CONF_DEROG_TIME,
+    DOMAIN,
+    PRESET_VACATION,
+)
+from custom_components.heatzy.settings import SAVE_DELAY, STORAGE_VERSION
 
 
 @pytest.mark.parametrize("entity_id", [ "number.test_pilote_v2_vacation"])
@@ -32,4 +49,52 @@ async def test_number(
     await hass.async_block_till_done()
 
     state = hass.states.get(entity_id)
-    assert state.state == str(2.0)
\ No newline at end of file
+    assert state.state == str(2.0)
+
+async def test_number_sets_derogation_delay(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """The climate entity reads the delay of its sibling number entity."""
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    data = {ATTR_ENTITY_ID: "number.test_pilote_v2_vacation", ATTR_VALUE: 5}
+    await hass.services.async_call(Platform.NUMBER, SERVICE_SET_VALUE, data, blocking=True)
+
+    data = {ATTR_ENTITY_ID: "climate.test_pilote_v2", ATTR_PRESET_MODE: PRESET_VACATION}
+    await hass.services.async_call(CLIM_DOMAIN, SERVICE_SET_PRESET_MODE, data, blocking=True)
+
+    HeatzyClient.websocket.async_control_device.assert_awaited_with(
+        "gizrKSNGrryMk9gAjWKFD3", {CONF_ATTRS: {CONF_DEROG_MODE: 1, CONF_DEROG_TIME: 5}}
+    )
+
+
+async def test_number_persisted(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+    hass_storage: dict[str, Any],
+):
+    """The settings are saved and survive a reload."""
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}.settings"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{config_entry.entry_id}.settings",
+        "data": {"gizrKSNGrryMk9gAjWKFD3": {ATTR_BOOST: 30}},
+    }
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("number.test_pilote_v2_boost").state == "30"
+
+    data = {ATTR_ENTITY_ID: "number.test_pilote_v2_vacation", ATTR_VALUE: 7}
+    await hass.services.async_call(Platform.NUMBER, SERVICE_SET_VALUE, data, blocking=True)
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=SAVE_DELAY))
+    await hass.async_block_till_done()
+
+    settings = hass_storage[f"{DOMAIN}.{config_entry.entry_id}.settings"]["data"]
+    assert settings["gizrKSNGrryMk9gAjWKFD3"] == {ATTR_BOOST: 30, ATTR_VACATION: 7}
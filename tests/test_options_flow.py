@@ -0,0 +1,43 @@
+"""Test the Heatzy options flow."""
+
+from unittest.mock import AsyncMock
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICES, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.heatzy.const import CONF_ZONES
+
+
+async def test_options_add_and_remove_zone(
+    hass: HomeAssistant, config_entry: ConfigEntry, HeatzyClient: AsyncMock
+) -> None:
+    """Test zones are added and removed from the options."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] == FlowResultType.MENU
+    assert result["menu_options"] == ["add_zone"]
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "add_zone"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_NAME: "Bedrooms", CONF_DEVICES: ["gizrKSNGrryMk9gAjWKFD3"]},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options == {CONF_ZONES: {"Bedrooms": ["gizrKSNGrryMk9gAjWKFD3"]}}
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "remove_zone"}
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_ZONES: ["Bedrooms"]}
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options == {CONF_ZONES: {}}
@@ -0,0 +1,100 @@
+"""Tests for the capture and the replay of the frames."""
+
+import copy
+import gzip
+import json
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import HomeAssistant
+
+from custom_components.heatzy.const import CONF_ATTRS, CONF_MODE, DOMAIN
+from custom_components.heatzy.recorder import async_replay, read_capture
+from custom_components.heatzy.services import (
+    SERVICE_START_CAPTURE,
+    SERVICE_STOP_CAPTURE,
+)
+
+DID = "gizrKSNGrryMk9gAjWKFD3"
+
+
+async def test_capture_and_replay(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Frames are captured redacted, then replayed into the coordinator."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    path = response["path"]
+
+    for mode in ("eco", "fro", "cft"):
+        device = copy.deepcopy(coordinator.data[DID])
+        device[CONF_ATTRS][CONF_MODE] = mode
+        device["mac"] = "f4:cf:a2:00:00:01"
+        coordinator._async_handle_websocket_data(device)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_STOP_CAPTURE,
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"frames": 3}
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file]
+    assert [line["frame"][CONF_ATTRS][CONF_MODE] for line in lines] == [
+        "eco",
+        "fro",
+        "cft",
+    ]
+    assert all(line["frame"]["mac"] == "**REDACTED**" for line in lines)
+    assert [line["t"] for line in lines] == sorted(line["t"] for line in lines)
+
+    frames = await hass.async_add_executor_job(read_capture, path)
+    coordinator.data[DID][CONF_ATTRS][CONF_MODE] = "eco"
+    coordinator._async_handle_websocket_data(copy.deepcopy(coordinator.data[DID]))
+    assert await async_replay(coordinator, path, None) == len(frames) == 3
+    assert coordinator.data[DID][CONF_ATTRS][CONF_MODE] == "cft"
+    assert hass.states.get("climate.test_pilote_v2").attributes["preset_mode"] == (
+        "comfort"
+    )
+    os.remove(path)
+
+
+async def test_replay_speed(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """The delays between the frames are divided by the speed."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    device = coordinator.data[DID]
+    frames = [(100.0, device), (101.0, device), (103.0, device)]
+
+    with (
+        patch("custom_components.heatzy.recorder.read_capture", return_value=frames),
+        patch(
+            "custom_components.heatzy.recorder.asyncio.sleep", new=AsyncMock()
+        ) as sleep,
+    ):
+        assert await async_replay(coordinator, "capture.jsonl.gz", 10) == 3
+
+    delays = [call.args[0] for call in sleep.await_args_list]
+    assert delays == pytest.approx([0, 0.1, 0.3], abs=0.05)
@@ -0,0 +1,163 @@
+"""Tests for the Heatzy sensors."""
+
+import asyncio
+import copy
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.heatzy.const import DOMAIN
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_latency_sensors(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Latency sensors report the round trip of confirmed commands."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_reg = er.async_get(hass)
+    p50 = entity_reg.async_get_entity_id(
+        "sensor", DOMAIN, f"{config_entry.entry_id}_latency_p50"
+    )
+    timeouts = entity_reg.async_get_entity_id(
+        "sensor", DOMAIN, f"{config_entry.entry_id}_command_timeouts"
+    )
+    assert hass.states.get(p50).state == STATE_UNKNOWN
+    assert hass.states.get(timeouts).state == "0"
+
+    coordinator = config_entry.runtime_data
+    reported = copy.deepcopy(coordinator.data["gizrKSNGrryMk9gAjWKFD3"])
+    coordinator.async_set_optimistic("gizrKSNGrryMk9gAjWKFD3", {"mode": "eco"})
+    coordinator.async_command_sent("gizrKSNGrryMk9gAjWKFD3")
+    # A duplicate of the reported state does not confirm the command
+    coordinator._async_handle_websocket_data(copy.deepcopy(reported))
+    assert coordinator.latency.count == 0
+
+    echo = copy.deepcopy(reported)
+    echo["attrs"]["mode"] = "eco"
+    coordinator._async_handle_websocket_data(echo)
+
+    # Written by the coordinator, the sensors are not polled
+    assert hass.states.get(p50).state != STATE_UNKNOWN
+    assert coordinator.latency.count == 1
+    assert coordinator.product_latency["51d16c22a5f74280bc3cfe9ebcdc6402"].count == 1
+
+
+async def test_latency_excludes_debounce(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """The round trip starts when the frame is written, not when it is queued."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    coordinator.commands.cooldown = 0.2
+    did = "gizrKSNGrryMk9gAjWKFD3"
+    echo = copy.deepcopy(coordinator.data[did])
+    echo["attrs"]["mode"] = "eco"
+
+    async def _send(did: str, config: dict) -> None:
+        coordinator._async_handle_websocket_data(copy.deepcopy(echo))
+
+    coordinator.async_set_optimistic(did, {"mode": "eco"})
+    await coordinator.commands.async_send(did, {"attrs": {"mode": "eco"}}, _send)
+    await asyncio.sleep(0.3)
+
+    assert coordinator.latency.count == 1
+    assert coordinator.latency.percentile(50) < 0.2
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_product_latency_sensors(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Each product of the account has its own latency sensors."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_reg = er.async_get(hass)
+    product_key = "51d16c22a5f74280bc3cfe9ebcdc6402"
+    p50, timeouts, other = (
+        entity_reg.async_get_entity_id(
+            "sensor", DOMAIN, f"{config_entry.entry_id}_{key}"
+        )
+        for key in (
+            f"latency_p50_{product_key}",
+            f"command_timeouts_{product_key}",
+            "latency_p50_a77a929fcf0d4631bc4f669080376891",
+        )
+    )
+    assert hass.states.get(p50).name.endswith("Pilote2 command latency p50")
+    assert hass.states.get(timeouts).state == "0"
+
+    coordinator = config_entry.runtime_data
+    coordinator._async_record_latency("gizrKSNGrryMk9gAjWKFD3", 0.25)
+    coordinator._async_record_latency("gizrKSNGrryMk9gAjWKFD3", None)
+
+    assert hass.states.get(p50).state == "250"
+    assert hass.states.get(timeouts).state == "1"
+    assert hass.states.get(other).state == STATE_UNKNOWN
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_counter_sensors(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Counter sensors report the activity of the account."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_reg = er.async_get(hass)
+    entity_ids = {
+        key: entity_reg.async_get_entity_id(
+            "sensor", DOMAIN, f"{config_entry.entry_id}_{key}"
+        )
+        for key in ("frames_per_minute", "changed_per_frame", "state_writes")
+    }
+    coordinator = config_entry.runtime_data
+    frames = coordinator.counters.frames
+    writes = coordinator.counters.state_writes
+    assert frames > 0
+
+    device = copy.deepcopy(coordinator.data["gizrKSNGrryMk9gAjWKFD3"])
+    device["attrs"]["mode"] = "eco"
+    coordinator._async_handle_websocket_data(device)
+    assert coordinator.counters.frames == frames + 1
+    assert coordinator.counters.state_writes > writes
+
+    assert int(hass.states.get(entity_ids["frames_per_minute"]).state) == frames + 1
+    assert hass.states.get(entity_ids["changed_per_frame"]).state != STATE_UNKNOWN
+    assert int(hass.states.get(entity_ids["state_writes"]).state) > writes
+
+
+async def test_sensors_disabled_by_default(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """The diagnostic sensors are registered, but not enabled."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_reg = er.async_get(hass)
+    entries = er.async_entries_for_config_entry(entity_reg, config_entry.entry_id)
+    sensors = [entry for entry in entries if entry.domain == "sensor"]
+    assert sensors
+    assert all(
+        entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION for entry in sensors
+    )
+    assert not config_entry.runtime_data._metrics_listeners
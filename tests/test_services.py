@@ -0,0 +1,134 @@
+"""Tests for the Heatzy services."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from heatzypy.exception import HeatzyException
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.heatzy.const import CONF_ATTRS, DOMAIN
+from custom_components.heatzy.services import SERVICE_BULK_CONTROL
+
+DIDS = ["gizrKSNGrryMk9gAjWKFD3", "DEiP7Sv17MMqRahsjb0oCb", "w5kwiwansHT0BlDiNQtzu7"]
+
+
+async def test_bulk_control(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """The payload is sent to every device and the results are returned."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_registry = dr.async_get(hass)
+    device_ids = [
+        device_registry.async_get_device(identifiers={(DOMAIN, did)}).id for did in DIDS
+    ]
+
+    async def _control(did, config):
+        if did == DIDS[1]:
+            raise HeatzyException("offline")
+
+    HeatzyClient.websocket.async_control_device.side_effect = _control
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_CONTROL,
+        {ATTR_DEVICE_ID: device_ids, CONF_ATTRS: {"mode": "eco"}},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert HeatzyClient.websocket.async_control_device.await_count == 3
+    results = response["devices"]
+    assert results[device_ids[0]] == {"did": DIDS[0], "success": True}
+    assert results[device_ids[1]] == {
+        "did": DIDS[1],
+        "success": False,
+        "error": "offline",
+    }
+    assert results[device_ids[2]]["success"] is True
+
+
+async def test_bulk_control_pilote_v1(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Pilote v1 devices are reported as failed, no frame is sent to them."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    device_id = (
+        dr.async_get(hass)
+        .async_get_device(identifiers={(DOMAIN, "AKcJWxXqnqrlTip2CB6buh")})
+        .id
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_CONTROL,
+        {ATTR_DEVICE_ID: [device_id], CONF_ATTRS: {"mode": "eco"}},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["devices"][device_id] == {
+        "did": "AKcJWxXqnqrlTip2CB6buh",
+        "success": False,
+        "error": "Pilote v1 not supported",
+    }
+    HeatzyClient.websocket.async_control_device.assert_not_awaited()
+    assert coordinator._optimistic == {}
+
+
+async def test_bulk_control_failure_rolled_back(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """A device not reached shows its reported state at once."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    mode = coordinator.data[DIDS[0]][CONF_ATTRS]["mode"]
+    device_id = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, DIDS[0])}).id
+    HeatzyClient.websocket.async_control_device.side_effect = HeatzyException("offline")
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_CONTROL,
+        {ATTR_DEVICE_ID: [device_id], CONF_ATTRS: {"mode": "eco"}},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert coordinator.data[DIDS[0]][CONF_ATTRS]["mode"] == mode
+    assert coordinator._optimistic == {}
+    assert coordinator.counters.command_failures == 1
+    # A failure, not a confirmation timeout
+    assert coordinator.latency.timeouts == 0
+
+
+async def test_bulk_control_unknown_device(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """Unknown devices are rejected before any command is sent."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BULK_CONTROL,
+            {ATTR_DEVICE_ID: ["unknown"], CONF_ATTRS: {"mode": "eco"}},
+            blocking=True,
+        )
+    HeatzyClient.websocket.async_control_device.assert_not_awaited()
@@ -9,6 +9,7 @@ from homeassistant.core import HomeAssistant, ServiceCall
 
 from custom_components.heatzy.const import (
     CONF_ATTRS,
+    CONF_CUR_SIGNAL,
     CONF_DEROG_MODE,
     CONF_LOCK,
     CONF_WINDOW,
@@ -120,4 +121,27 @@ async def test_presence_switch(
     state = hass.states.get(entity_id)
     climate_state = hass.states.get('climate.test_pilote_pro')
     assert state.state == STATE_ON
-    assert climate_state.state == HVACMode.AUTO
\ No newline at end of file
+    assert climate_state.state == HVACMode.AUTO
+
+async def test_unchanged_state_not_written(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    HeatzyClient: AsyncMock,
+):
+    """A change of the signal rewrites the climate, not the lock switch."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    lock = hass.states.get("switch.test_pilote_pro_lock")
+    skipped = coordinator.counters.skipped_writes
+
+    device = copy.deepcopy(coordinator.data["6wHqU2TvH0YUUZVhdfLhi6"])
+    device[CONF_ATTRS][CONF_CUR_SIGNAL] = "eco"
+    coordinator._async_handle_websocket_data(device)
+    await hass.async_block_till_done()
+
+    climate_state = hass.states.get("climate.test_pilote_pro")
+    assert climate_state.attributes["current_signal"] == "eco"
+    assert coordinator.counters.skipped_writes > skipped
+    assert hass.states.get("switch.test_pilote_pro_lock").last_reported == lock.last_reported